@@ -0,0 +1,166 @@
+"""Process-wide admission control for backend calls.
+
+Every session's calls pass through one AdmissionController. Each endpoint has
+a limit on calls in flight at once; calls over it wait in a queue that takes
+clients in turn, one call each, so a recruiter scoring a large batch cannot
+hold everyone else back. Once an endpoint's queue is full, further calls are
+turned away at once with Overloaded instead of piling up until they time out.
+"""
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Dict, Hashable, Optional
+
+
+class Overloaded(Exception):
+    """Raised instead of queueing a call when its endpoint's queue is full"""
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        super().__init__("The service is too busy right now, please try again in a minute")
+
+
+class _Ticket:
+    __slots__ = ("client", "admitted")
+
+    def __init__(self, client: Hashable):
+        self.client = client
+        self.admitted = False
+
+
+class _EndpointQueue:
+    """Calls in flight for one endpoint, and those waiting for a slot"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.running = 0
+        self.waiting = OrderedDict()  # client -> deque of tickets; the next client to admit first
+
+    @property
+    def queued(self) -> int:
+        return sum(len(tickets) for tickets in self.waiting.values())
+
+    def position(self, ticket: _Ticket) -> int:
+        """Place of a waiting ticket in the queue, counted from 1.
+
+        Clients are admitted in turn, so a client's i-th ticket (from 0)
+        follows every client's first i tickets, plus the i-th tickets of the
+        clients whose turn comes before its own.
+        """
+        index = self.waiting[ticket.client].index(ticket)
+        position = 1 + sum(min(len(tickets), index) for tickets in self.waiting.values())
+        for client, tickets in self.waiting.items():
+            if client == ticket.client:
+                return position
+            position += len(tickets) > index
+        return position
+
+    def admit(self):
+        """Hand free slots to waiting tickets, one client at a time"""
+        while self.running < self.limit and self.waiting:
+            client, tickets = next(iter(self.waiting.items()))
+            tickets.popleft().admitted = True
+            self.running += 1
+            if tickets:
+                self.waiting.move_to_end(client)
+            else:
+                del self.waiting[client]
+
+    def remove(self, ticket: _Ticket):
+        tickets = self.waiting[ticket.client]
+        tickets.remove(ticket)
+        if not tickets:
+            del self.waiting[ticket.client]
+
+
+class AdmissionController:
+    """Thread-safe per-endpoint concurrency limits with a fair, bounded queue.
+
+    `limits` maps endpoints to the calls each may have in flight at once,
+    others get `default_limit`. At most `max_queue` calls wait per endpoint.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None, default_limit: int = 16, max_queue: int = 50):
+        self.limits = dict(limits or {})
+        self.default_limit = default_limit
+        self.max_queue = max_queue
+        self._cond = threading.Condition()
+        self._queues: Dict[str, _EndpointQueue] = {}
+
+    def _queue(self, endpoint: str) -> _EndpointQueue:
+        queue = self._queues.get(endpoint)
+        if queue is None:
+            queue = self._queues[endpoint] = _EndpointQueue(self.limits.get(endpoint, self.default_limit))
+        return queue
+
+    def acquire(self, endpoint: str, client: Hashable = None,
+                on_wait: Optional[Callable[[int], None]] = None) -> float:
+        """Wait for a slot to call the endpoint and return the seconds waited.
+
+        client identifies whose call it is, for fair turns; calls without one
+        share a turn. While the call waits, on_wait is called on this thread
+        with its place in the queue whenever that changes, then with 0 once
+        it is admitted. Raises Overloaded if the queue is full. Every
+        acquire must be matched by a release.
+        """
+        with self._cond:
+            queue = self._queue(endpoint)
+            if queue.running < queue.limit and not queue.waiting:
+                queue.running += 1
+                return 0.0
+            if queue.queued >= self.max_queue:
+                raise Overloaded(endpoint)
+            ticket = _Ticket(client)
+            queue.waiting.setdefault(client, deque()).append(ticket)
+            self._cond.notify_all()  # a new client can move others back a place
+
+        start = time.monotonic()
+        reported = None
+        try:
+            while True:
+                with self._cond:
+                    while not ticket.admitted and queue.position(ticket) == reported:
+                        self._cond.wait()
+                    position = 0 if ticket.admitted else queue.position(ticket)
+                if on_wait is not None:
+                    # Called without the lock held, it may take a while to draw
+                    on_wait(position)
+                if position == 0:
+                    return time.monotonic() - start
+                reported = position
+        except BaseException:
+            # e.g. the session's script run was stopped while it waited
+            with self._cond:
+                if ticket.admitted:
+                    queue.running -= 1
+                    queue.admit()
+                else:
+                    queue.remove(ticket)
+                self._cond.notify_all()
+            raise
+
+    def release(self, endpoint: str):
+        """Free a slot taken by acquire"""
+        with self._cond:
+            queue = self._queue(endpoint)
+            queue.running -= 1
+            queue.admit()
+            self._cond.notify_all()
+
+    def queue_position(self, client: Hashable) -> Optional[int]:
+        """The best place any of a client's waiting calls holds in its queue, None if none is waiting"""
+        with self._cond:
+            positions = [
+                queue.position(ticket)
+                for queue in self._queues.values()
+                for ticket in queue.waiting.get(client, ())
+            ]
+        return min(positions) if positions else None
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Endpoint -> calls running, calls queued and the endpoint's limit"""
+        with self._cond:
+            return {
+                endpoint: {"running": queue.running, "queued": queue.queued, "limit": queue.limit}
+                for endpoint, queue in sorted(self._queues.items())
+            }
@@ -0,0 +1,38 @@
+import base64
+import json
+import time
+from typing import Dict, Optional
+
+
+def decode_claims(token: str) -> Dict:
+    """Claims carried by a JWT access token, or {} for opaque tokens.
+
+    The signature is not checked. Claims only save the app a round-trip to
+    look up who is logged in; the backend still verifies the token on every
+    call, so a forged token gets no further than the login redirect.
+    """
+    parts = token.split(".")
+    if len(parts) != 3:
+        return {}
+    try:
+        payload = base64.urlsafe_b64decode(parts[1] + "=" * (-len(parts[1]) % 4))
+        claims = json.loads(payload)
+    except (ValueError, UnicodeDecodeError):
+        return {}
+    return claims if isinstance(claims, dict) else {}
+
+
+def identity_from_claims(claims: Dict) -> Optional[Dict]:
+    """The user_id and role in a token's claims, or None unless both are there"""
+    if claims.get("user_id") is None or not claims.get("role"):
+        return None
+    return {"user_id": claims["user_id"], "role": claims["role"]}
+
+
+def token_expiry(claims: Dict, expires_in: Optional[float] = None) -> Optional[float]:
+    """Unix time a token expires, from its exp claim or the token response's expires_in"""
+    if isinstance(claims.get("exp"), (int, float)):
+        return float(claims["exp"])
+    if expires_in:
+        return time.time() + float(expires_in)
+    return None
@@ -0,0 +1,330 @@
+"""Per-rerun benchmarks for each page of the app.
+
+Runs app.py headlessly with streamlit.testing's AppTest against the local
+stand-in backend (mock_backend.py, in a subprocess with injected latency and
+limited bandwidth)
+and measures, for each scenario, the rerun wall time, backend calls and
+bytes transferred during the rerun, and peak Python memory allocated by the
+app process.
+
+    python benchmarks/bench_reruns.py                      # compare against baseline.json
+    python benchmarks/bench_reruns.py --update-baseline    # record a new baseline
+
+AppTest always reruns the whole script, so scenarios that interact with a
+fragment (such as the profile editor sections) measure a full-page rerun,
+an upper bound on what the browser sees.
+
+Exits with status 1 if any metric regresses past its tolerance. Wall times
+and memory depend on the machine, so record the baseline on the machine
+that runs the comparison.
+"""
+import argparse
+import json
+import logging
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+import urllib.request
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "app.py")
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Allowed growth over the baseline before a metric counts as a regression
+TOLERANCES = {
+    "wall_time_s": 0.25,
+    "backend_calls": 0.0,
+    "bytes_transferred": 0.10,
+    "peak_memory_bytes": 0.25,
+}
+
+# Seconds the stand-in takes to start when asleep, and how long a user takes to
+# type their credentials once the login page is shown
+COLD_START = 1.0
+TYPING_TIME = 1.5
+
+# Realistic data sizes
+PROFILE_EXPERIENCES = 10
+PROFILE_BULLETS = 20
+MATCH_COUNT = 500
+
+
+def large_profile() -> dict:
+    """Candidate profile with long work history"""
+    return {
+        "parsed_resume": {
+            "name": "Bench Candidate",
+            "linkedin": "https://www.linkedin.com/in/bench-candidate",
+            "github": "https://github.com/benchcandidate",
+            "skills": [f"Skill {i}" for i in range(40)],
+            "total_years_of_experience": "15",
+            "education": [{
+                "institution": f"University {i}",
+                "degree": "MSc",
+                "GPA": "3.8",
+                "graduation": str(2005 + i),
+                "coursework": [f"Course {j}" for j in range(10)]
+            } for i in range(3)],
+            "experience": [{
+                "role": f"Engineer {i}",
+                "organization": f"Company {i}",
+                "timeline": {"start": str(2008 + i), "end": str(2009 + i)},
+                "details": [f"Delivered project {i}-{j} improving throughput by {j}%" for j in range(PROFILE_BULLETS)],
+                "skills_related": ["Python", "SQL", "Kubernetes"]
+            } for i in range(PROFILE_EXPERIENCES)],
+            "accomplishments_and_projects": [{
+                "name": f"Project {i}",
+                "skills_related": ["Python"],
+                "details": [f"Detail {j}" for j in range(5)]
+            } for i in range(5)]
+        },
+        "s3_link": "https://mock-bucket.local/bench/resume.pdf"
+    }
+
+
+class Backend:
+    """The stand-in backend running in its own process"""
+
+    def __init__(self, latency: float, bandwidth: float = 0):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.join(ROOT, "mock_backend.py"),
+             "--port", str(port), "--latency", str(latency), "--bandwidth", str(bandwidth), "--quiet"],
+            cwd=ROOT, stdout=subprocess.PIPE
+        )
+        self.process.stdout.readline()  # wait for the listening message
+
+    def admin(self, path: str, payload=None) -> dict:
+        data = json.dumps(payload).encode() if payload is not None else None
+        method = "POST" if path != "stats" else "GET"
+        request = urllib.request.Request(f"{self.url}/__admin/{path}", data=data, method=method)
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())
+
+    def close(self):
+        self.process.terminate()
+        self.process.wait()
+
+
+def new_app(session: dict = None) -> AppTest:
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    for key, value in (session or {}).items():
+        at.session_state[key] = value
+    return at
+
+
+def wait_for_warmup(timeout: float = 10):
+    """Let a warm-up ping sent by the login page finish, so it is counted with the run that sent it"""
+    shared = sys.modules.get("shared")  # imported by the app, after API_BASE_URL is set
+    deadline = time.monotonic() + timeout
+    while shared and shared.get_backend_warmup().started_at is not None and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+def click(at: AppTest, label: str):
+    next(button for button in at.button if button.label == label).click()
+    return at.run()
+
+
+def click_find_matches(at: AppTest):
+    return next(
+        button for button in at.button if button.label == "Find Matches" and button.proto.type == "primary"
+    ).click().run()
+
+
+def apply_experience_edit(at: AppTest):
+    """Edit the first experience entry and apply its form"""
+    role = next(widget for widget in at.text_input if (widget.key or "").startswith("role_0_"))
+    role.set_value("Staff Engineer")
+    form_id = role.proto.form_id
+    return next(button for button in at.button if button.label == "Apply" and button.proto.form_id == form_id).click().run()
+
+
+def scenarios(backend: "Backend", users: dict) -> dict:
+    """Each scenario is (setup, rerun): setup returns an AppTest, rerun performs the measured rerun"""
+    candidate = {
+        "user_token": users["bench_candidate"]["token"],
+        "user_id": users["bench_candidate"]["user_id"],
+        "role": "candidate",
+    }
+    recruiter = {
+        "user_token": users["bench_recruiter"]["token"],
+        "user_id": users["bench_recruiter"]["user_id"],
+        "role": "recruiter",
+    }
+
+    def login_first_paint():
+        return new_app()
+
+    def login_submit(username: str = "bench_recruiter"):
+        at = new_app().run()
+        wait_for_warmup()
+        at.text_input(key="login_username").set_value(username)
+        at.text_input(key="login_password").set_value("password")
+        return at
+
+    def cold_start_login():
+        """The first login after the backend went to sleep, which the login page's warm-up ping hides"""
+        backend.admin("sleep", {"cold_start": COLD_START})
+        at = new_app().run()
+        time.sleep(TYPING_TIME)
+        at.text_input(key="login_username").set_value("bench_recruiter")
+        at.text_input(key="login_password").set_value("password")
+        return at
+
+    def profile_page():
+        return new_app(dict(candidate, current_page="candidate_profile"))
+
+    def profile_loaded():
+        return profile_page().run()
+
+    def dashboard():
+        at = new_app(dict(candidate, current_page="candidate_dashboard")).run()
+        at.text_input[0].set_value("https://jobs.example.com/posting/42")
+        return at
+
+    def find_matches():
+        at = new_app(dict(recruiter, current_page="recruiter_find_matches")).run()
+        at.text_input[0].set_value("https://jobs.example.com/posting/42")
+        return at
+
+    def searched():
+        at = find_matches()
+        return click_find_matches(at)
+
+    return {
+        "login_page/first_paint": (login_first_paint, lambda at: at.run()),
+        "login_page/login": (login_submit, lambda at: click(at, "Login")),
+        # Through to the first paint of the profile page the candidate lands on
+        "login_page/candidate_login": (lambda: login_submit("bench_candidate"), lambda at: click(at, "Login")),
+        "login_page/cold_start_login": (cold_start_login, lambda at: click(at, "Login")),
+        "candidate_profile/load": (profile_page, lambda at: at.run()),
+        "candidate_profile/edit_rerun": (profile_loaded, apply_experience_edit),
+        "candidate_dashboard/match_score": (dashboard, lambda at: click(at, "Find Match Score")),
+        f"recruiter_find_matches/{MATCH_COUNT}_matches": (find_matches, click_find_matches),
+        "recruiter_find_matches/next_page": (
+            searched, lambda at: at.number_input(key="matches_page").increment().run()
+        ),
+        "recruiter_find_matches/filter_rerank": (
+            searched, lambda at: at.text_input(key="matches_required_skills").set_value("python, sql").run()
+        ),
+    }
+
+
+def clear_caches():
+    """Start each measurement from cold process-wide caches"""
+    st.cache_resource.clear()
+
+
+def measure(backend: Backend, setup, rerun, repeat: int) -> dict:
+    times = []
+    for _ in range(repeat):
+        clear_caches()
+        at = setup()
+        backend.admin("reset_stats", {})
+        start = time.perf_counter()
+        at = rerun(at)
+        times.append(time.perf_counter() - start)
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        wait_for_warmup()
+        stats = backend.admin("stats")
+
+    # Separate pass for memory, since tracing slows everything down
+    clear_caches()
+    at = setup()
+    tracemalloc.start()
+    rerun(at)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "wall_time_s": round(statistics.median(times), 4),
+        "backend_calls": stats["calls"],
+        "bytes_transferred": stats["bytes_in"] + stats["bytes_out"],
+        "peak_memory_bytes": peak,
+    }
+
+
+def compare(results: dict, baseline: dict) -> list:
+    regressions = []
+    for scenario, metrics in results.items():
+        for metric, value in metrics.items():
+            expected = baseline.get(scenario, {}).get(metric)
+            if expected is None:
+                continue
+            limit = expected * (1 + TOLERANCES[metric])
+            if value > limit and value - expected > 1e-3:
+                regressions.append(f"{scenario} {metric}: {value} > baseline {expected} (+{TOLERANCES[metric]:.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds of backend latency per request")
+    parser.add_argument("--bandwidth", type=float, default=12.5e6,
+                        help="Bytes per second the backend sends responses at, 0 for no limit")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per scenario")
+    parser.add_argument("--only", help="Run only scenarios containing this text")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline")
+    args = parser.parse_args()
+
+    # Clearing caches from outside a script run makes Streamlit warn every time
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").disabled = True
+    backend = Backend(args.latency, args.bandwidth)
+    os.environ["API_BASE_URL"] = backend.url
+    try:
+        seeded = backend.admin("seed", {
+            "users": [
+                {"username": "bench_candidate", "password": "password", "role": "candidate",
+                 "profile": large_profile()},
+                {"username": "bench_recruiter", "password": "password", "role": "recruiter"},
+            ],
+            "resumes": [large_profile()["parsed_resume"] for _ in range(MATCH_COUNT)],
+        })
+        results = {}
+        for name, (setup, rerun) in scenarios(backend, seeded["users"]).items():
+            if args.only and args.only not in name:
+                continue
+            results[name] = measure(backend, setup, rerun, args.repeat)
+            print(f"{name:45} {json.dumps(results[name])}")
+    finally:
+        backend.close()
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({"latency": args.latency, "bandwidth": args.bandwidth, "results": results},
+                      f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("No baseline to compare against, run with --update-baseline first")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline["latency"] != args.latency or baseline.get("bandwidth", 0) != args.bandwidth:
+        print(f"Baseline was recorded with --latency {baseline['latency']} --bandwidth {baseline.get('bandwidth', 0)}, "
+              "comparison may be meaningless")
+    regressions = compare(results, baseline["results"])
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        sys.exit(1)
+    print("No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
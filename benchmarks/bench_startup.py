@@ -0,0 +1,132 @@
+"""Cold start benchmarks: the first paint of each page in a fresh process.
+
+Each sample starts a new Python process, imports Streamlit (which a server
+process has already done before any session connects) and then times the
+app's first run of one page with streamlit.testing's AppTest, against the
+local stand-in backend. Reported per page, as medians:
+
+    process_s        wall time of the whole process, interpreter start to exit
+    first_paint_s    the app's first script run, imports included
+    modules_loaded   modules the first run imported
+    pandas           whether the first run imported pandas
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --app /path/to/other/checkout/app.py
+
+Exits with status 1 if a page that has no use for pandas imports it.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from bench_reruns import APP_PATH, Backend, large_profile
+
+# Pages whose first paint must not pay for importing pandas
+PANDAS_FREE_PAGES = ("login", "recruiter_find_matches")
+
+FIRST_PAINT = r"""
+import json
+import sys
+import time
+from streamlit.testing.v1 import AppTest
+
+app_path, session = sys.argv[1], json.loads(sys.argv[2])
+before = set(sys.modules)
+start = time.perf_counter()
+at = AppTest.from_file(app_path, default_timeout=120)
+for key, value in session.items():
+    at.session_state[key] = value
+at.run()
+first_paint = time.perf_counter() - start
+if at.exception:
+    sys.exit(at.exception[0].message)
+print(json.dumps({
+    "first_paint_s": first_paint,
+    "modules_loaded": len(set(sys.modules) - before),
+    "pandas": "pandas" in sys.modules,
+}))
+"""
+
+
+def sessions(users: dict) -> dict:
+    """Session state that opens each page"""
+    candidate = {
+        "user_token": users["bench_candidate"]["token"],
+        "user_id": users["bench_candidate"]["user_id"],
+        "role": "candidate",
+    }
+    recruiter = {
+        "user_token": users["bench_recruiter"]["token"],
+        "user_id": users["bench_recruiter"]["user_id"],
+        "role": "recruiter",
+    }
+    return {
+        "login": {},
+        "candidate_dashboard": dict(candidate, current_page="candidate_dashboard"),
+        "candidate_profile": dict(candidate, current_page="candidate_profile"),
+        "recruiter_find_matches": dict(recruiter, current_page="recruiter_find_matches"),
+    }
+
+
+def measure(app_path: str, session: dict, repeat: int, env: dict) -> dict:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, "-c", FIRST_PAINT, app_path, json.dumps(session)],
+            cwd=os.path.dirname(app_path), env=env, capture_output=True, text=True
+        )
+        process = time.perf_counter() - start
+        if output.returncode != 0:
+            raise RuntimeError(output.stderr.strip().splitlines()[-1])
+        samples.append(dict(json.loads(output.stdout.strip().splitlines()[-1]), process_s=process))
+
+    return {
+        "process_s": round(statistics.median(sample["process_s"] for sample in samples), 4),
+        "first_paint_s": round(statistics.median(sample["first_paint_s"] for sample in samples), 4),
+        "modules_loaded": samples[-1]["modules_loaded"],
+        "pandas": samples[-1]["pandas"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", default=APP_PATH, help="Entry script to measure")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds of backend latency per request")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh processes per page")
+    parser.add_argument("--only", help="Run only pages containing this text")
+    args = parser.parse_args()
+
+    backend = Backend(args.latency)
+    env = dict(os.environ, API_BASE_URL=backend.url)
+    failures = []
+    try:
+        seeded = backend.admin("seed", {
+            "users": [
+                {"username": "bench_candidate", "password": "password", "role": "candidate",
+                 "profile": large_profile()},
+                {"username": "bench_recruiter", "password": "password", "role": "recruiter"},
+            ],
+        })
+        for page, session in sessions(seeded["users"]).items():
+            if args.only and args.only not in page:
+                continue
+            result = measure(os.path.abspath(args.app), session, args.repeat, env)
+            print(f"{page:25} {json.dumps(result)}")
+            if result["pandas"] and page in PANDAS_FREE_PAGES:
+                failures.append(page)
+    finally:
+        backend.close()
+
+    for page in failures:
+        print(f"REGRESSION {page} imports pandas on first paint")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Canonical form of job posting URLs.
+
+The same posting is shared in many spellings: with tracking parameters,
+through mobile or regional hosts, with or without a trailing slash, an
+apply-page suffix or a fragment. canonical_job_link maps them all to one
+URL, which is used as the key for match caching and request dedup. The
+backend is still sent the link as the user gave it.
+
+Job boards with their own URL schemes are handled by the table-driven
+SITE_RULES, which also drop their tracking parameters. Any other URL only
+has its utm_* parameters and fragment removed, as its own parameters may
+select the posting. tests/test_job_links.py checks the rules.
+"""
+import re
+from dataclasses import dataclass
+from typing import Callable, FrozenSet, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track where a click came from on any site. Names
+# like ref or source may mean something else to a site without a rule.
+TRACKING_PREFIXES = ("utm_",)
+
+
+@dataclass(frozen=True)
+class SiteRule:
+    """How one job board spells a posting's canonical URL"""
+    name: str
+    hosts: "re.Pattern"  # full match against the lower-cased host
+    host: str = ""  # replacement for the matched host, "" keeps it
+    # Query parameters that, when all present, determine the path, e.g. a job id passed as a parameter
+    query_paths: Tuple[Tuple[Tuple[str, ...], str], ...] = ()
+    # (pattern, replacement) pairs for the path, the first one that matches wins
+    paths: Tuple[Tuple["re.Pattern", Union[str, Callable]], ...] = ()
+    # Query parameters that identify the posting; all others are dropped
+    keep_params: FrozenSet[str] = frozenset()
+
+
+SITE_RULES = (
+    SiteRule(
+        name="LinkedIn",
+        hosts=re.compile(r"(?:www\.|m\.|[a-z]{2}\.)?linkedin\.com"),
+        host="www.linkedin.com",
+        query_paths=((("currentJobId",), "/jobs/view/{currentJobId}"),),
+        paths=((re.compile(r"^(?:/comm)?/jobs/view/(?:[^/]*-)?(\d+)(?:/.*)?$"), r"/jobs/view/\1"),),
+    ),
+    SiteRule(
+        name="Greenhouse",
+        hosts=re.compile(r"(?:boards|job-boards)(\.eu)?\.greenhouse\.io"),
+        host=r"job-boards\1.greenhouse.io",
+        query_paths=((("for", "token"), "/{for}/jobs/{token}"),),
+        paths=((re.compile(r"^/([^/]+)/jobs/(\d+)(?:/.*)?$"), r"/\1/jobs/\2"),),
+    ),
+    SiteRule(
+        name="Lever",
+        hosts=re.compile(r"jobs(?:\.eu)?\.lever\.co"),
+        paths=((
+            re.compile(r"^/([^/]+)/([0-9a-fA-F]{8}-[0-9a-fA-F-]{27})(?:/apply)?$"),
+            lambda match: f"/{match[1].lower()}/{match[2].lower()}"
+        ),),
+    ),
+    SiteRule(
+        name="Workday",
+        hosts=re.compile(r"[a-z0-9-]+\.wd\d+\.myworkdayjobs(?:-impl)?\.com"),
+        # /<locale>/<site>/job/<location>/<title>_<requisition> and /<site>/details/<title>_<requisition>
+        paths=((
+            re.compile(r"^(?:/[a-z]{2}-[A-Z]{2})?/([^/]+)/(?:job/[^/]+|details)/([^/]+?)(?:/apply(?:/[^/]*)?)?$"),
+            r"/\1/details/\2"
+        ),),
+    ),
+)
+
+
+def site_rule(host: str):
+    """The rule for a lower-cased host, or None for sites without one"""
+    return next((rule for rule in SITE_RULES if rule.hosts.fullmatch(host)), None)
+
+
+def is_tracking_param(name: str) -> bool:
+    return name.lower().startswith(TRACKING_PREFIXES)
+
+
+def canonical_job_link(job_link: str) -> str:
+    """Canonical URL of a job posting, so equivalent links share cache entries and requests.
+
+    Links that cannot be parsed, e.g. with a port that is not a number, are
+    returned stripped but otherwise as given, for the backend to judge.
+    """
+    link = job_link.strip()
+    if "://" not in link:
+        link = f"https://{link}"
+    try:
+        parts = urlsplit(link)
+        port = parts.port
+    except ValueError:
+        return job_link.strip()
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if ":" in host:
+        # An IPv6 address, which needs its brackets back
+        host = f"[{host}]"
+    if port and port != {"http": 80, "https": 443}.get(scheme):
+        host = f"{host}:{port}"
+    path = re.sub(r"/{2,}", "/", parts.path).rstrip("/")
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    # Hash-routed single page apps keep the route in the fragment
+    fragment = parts.fragment if parts.fragment.startswith(("/", "!")) else ""
+
+    rule = site_rule(host)
+    if rule is None:
+        query = [(name, value) for name, value in query if not is_tracking_param(name)]
+    else:
+        scheme = "https"
+        fragment = ""
+        params = dict(query)
+        for names, template in rule.query_paths:
+            if all(params.get(name) for name in names):
+                path = template.format(**{name: params[name] for name in names})
+                break
+        for pattern, replacement in rule.paths:
+            path, replaced = pattern.subn(replacement, path)
+            if replaced:
+                break
+        query = [(name, value) for name, value in query if name in rule.keep_params]
+        if rule.host:
+            host = rule.hosts.sub(rule.host, host)
+
+    return urlunsplit((scheme, host, path, urlencode(sorted(query)), fragment))
+
@@ -0,0 +1,106 @@
+"""JSON encoding and decoding for backend bodies, fast for the large ones.
+
+Uses orjson when it is installed and the standard library otherwise; the
+results are the same either way. ArrayDecoder decodes a JSON array as its
+bytes arrive, so a long list of matches can be shown while the rest of it
+is still downloading.
+"""
+import codecs
+import json
+from typing import Any, Iterable, Iterator, List
+
+try:
+    import orjson
+except ImportError:  # optional, only faster
+    orjson = None
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+
+
+def loads(data: bytes) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def response_json(response) -> Any:
+    """A requests response's JSON body, decoded with loads rather than response.json()"""
+    return loads(response.content)
+
+
+class ArrayDecoder:
+    """Incremental decoder for a JSON array, fed its bytes in pieces.
+
+    Each piece returns the items it completed. Items are decoded by the
+    standard library's scanner, one at a time, as soon as the bytes after
+    them show they are complete.
+    """
+
+    def __init__(self):
+        self._text = ""
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._scanner = json.JSONDecoder()
+        self._expect = "["  # "[", "first" item or "]", "item", "," or "]", "end"
+
+    @property
+    def done(self) -> bool:
+        return self._expect == "end"
+
+    def feed(self, data: bytes, final: bool = False) -> List:
+        """Decode the next piece, final for the last; raises ValueError if the body is not a JSON array"""
+        text = self._text + self._utf8.decode(data, final)
+        pos, items = 0, []
+        while not self.done:
+            while pos < len(text) and text[pos] in _WHITESPACE:
+                pos += 1
+            if pos == len(text):
+                break
+            char = text[pos]
+            if self._expect == "[":
+                if char != "[":
+                    raise ValueError("Expected a JSON array")
+                self._expect = "first"
+                pos += 1
+            elif char == "]" and self._expect in ("first", ","):
+                self._expect = "end"
+                pos += 1
+            elif self._expect == ",":
+                if char != ",":
+                    raise ValueError(f"Expected , or ] but found {char!r}")
+                self._expect = "item"
+                pos += 1
+            else:
+                try:
+                    item, end = self._scanner.raw_decode(text, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    break
+                if not final and (end == len(text) or text[end] not in _DELIMITERS):
+                    # A number cut short, e.g. 2. of 2.5, goes on in the next piece
+                    break
+                items.append(item)
+                self._expect = ","
+                pos = end
+        self._text = text[pos:]
+        if final and not self.done:
+            raise ValueError("The JSON array is incomplete")
+        return items
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[List]:
+    """Lists of the items each chunk of a JSON array's bytes completes"""
+    decoder = ArrayDecoder()
+    for chunk in chunks:
+        items = decoder.feed(chunk)
+        if items:
+            yield items
+    items = decoder.feed(b"", final=True)
+    if items:
+        yield items
@@ -0,0 +1,84 @@
+from typing import Dict, List
+
+import pandas as pd
+
+# Profile fields that become table columns
+PROFILE_FIELDS = ["name", "total_years_of_experience", "skills", "experience", "education"]
+
+TABLE_COLUMNS = ["match_score", "years_of_experience", "name", "latest_role", "institution", "skills", "resume_link"]
+
+
+def flatten_matches(matches: List[Dict]) -> pd.DataFrame:
+    """One row per match with the profile fields recruiters filter and rank on.
+
+    The index is each match's position in the list, so rows can be mapped back
+    to the raw matches after filtering and sorting.
+    """
+    if not matches:
+        return pd.DataFrame(columns=TABLE_COLUMNS)
+    # Building frames from records stays in pandas' C paths; json_normalize walks every record in Python
+    frame = pd.DataFrame.from_records(matches, columns=["match_score", "resume_link", "user_profile"])
+    profiles = pd.DataFrame.from_records(frame["user_profile"].tolist(), columns=PROFILE_FIELDS)
+
+    return pd.DataFrame({
+        "match_score": pd.to_numeric(frame["match_score"], errors="coerce").fillna(0).astype(int),
+        "years_of_experience": pd.to_numeric(profiles["total_years_of_experience"], errors="coerce"),
+        "name": profiles["name"],
+        # Resumes list the most recent entries first. A column of only missing
+        # sections, or only empty ones, is float, which has no .str accessor.
+        "latest_role": profiles["experience"].astype(object).str.get(0).astype(object).str.get("role"),
+        "institution": profiles["education"].astype(object).str.get(0).astype(object).str.get("institution"),
+        "skills": profiles["skills"],
+        "resume_link": frame["resume_link"],
+    })
+
+
+def _normalized_skills(table: pd.DataFrame) -> pd.Series:
+    """Every listed skill, lower-cased, one row per skill indexed by match"""
+    return table["skills"].explode().dropna().astype(str).str.strip().str.lower()
+
+
+def skill_overlap(table: pd.DataFrame, skills: List[str]) -> pd.Series:
+    """Per match, how many of the given skills the candidate lists (case-insensitive)"""
+    wanted = {skill.strip().lower() for skill in skills if skill.strip()}
+    if not wanted:
+        return pd.Series(0, index=table.index)
+    listed = _normalized_skills(table)
+    return listed[listed.isin(wanted)].groupby(level=0).nunique().reindex(table.index, fill_value=0)
+
+
+def filter_matches(table: pd.DataFrame, min_score: int = 0, min_years: float = 0,
+                   required_skills: List[str] = ()) -> pd.DataFrame:
+    """Matches scoring at least min_score, with min_years of experience and every required skill"""
+    keep = table["match_score"] >= min_score
+    if min_years:
+        keep &= table["years_of_experience"].fillna(0) >= min_years
+    required = [skill for skill in required_skills if skill.strip()]
+    if required:
+        keep &= skill_overlap(table, required) == len({skill.strip().lower() for skill in required})
+    return table[keep]
+
+
+def rank_matches(table: pd.DataFrame, query_skills: List[str], weights: Dict[str, float],
+                 sort_by: str = "rank_score") -> pd.DataFrame:
+    """Add skill_overlap and a weighted rank_score, and sort by sort_by, best first.
+
+    weights maps "match_score", "years_of_experience" and "skill_overlap" to
+    their weight. Each is scaled to 0-1 over the table before weighting, so
+    the weights are comparable. Ties keep the backend's order.
+    """
+    overlap = skill_overlap(table, query_skills)
+    years = table["years_of_experience"].fillna(0)
+
+    def scaled(values: pd.Series) -> pd.Series:
+        top = values.max() if len(values) else 0
+        return values / top if top > 0 else values * 0
+
+    rank_score = (
+        weights.get("match_score", 0) * table["match_score"] / 100
+        + weights.get("years_of_experience", 0) * scaled(years)
+        + weights.get("skill_overlap", 0) * scaled(overlap)
+    )
+    ranked = table.assign(skill_overlap=overlap, rank_score=rank_score.round(3))
+    return ranked.sort_values(sort_by, ascending=False, kind="stable")
+
@@ -0,0 +1,273 @@
+"""Process-wide latency and call-count metrics for backend calls and page renders.
+
+Counters are always exact. Latency and payload-size observations are sampled
+at `sample_rate` so the cost per request stays negligible under load.
+"""
+import json
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+# Histogram bucket upper bounds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)  # seconds
+SIZE_BUCKETS = (1024, 10240, 102400, 1048576, 10485760, 104857600)  # bytes
+
+# Path segments that are ids rather than part of the route, e.g. job ids
+_ID_SEGMENT = re.compile(r"/[0-9a-fA-F-]{16,}(?=/|$)")
+
+
+def endpoint_label(endpoint: str) -> str:
+    """Collapse ids in an endpoint path so each route gets one set of metrics"""
+    return _ID_SEGMENT.sub("/{id}", endpoint)
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets"""
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        index = 0
+        while index < len(self.buckets) and value > self.buckets[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by interpolating within its bucket"""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "buckets": dict(zip([*map(str, self.buckets), "+Inf"], self.counts)),
+        }
+
+
+class Metrics:
+    """Thread-safe registry of request and page render metrics"""
+
+    def __init__(self, sample_rate: float = 1.0):
+        self.sample_rate = sample_rate
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.requests = {}  # (method, endpoint) -> stats
+        self.pages = {}  # page -> stats
+
+    def _request_stats(self, method: str, endpoint: str) -> Dict:
+        key = (method, endpoint_label(endpoint))
+        stats = self.requests.get(key)
+        if stats is None:
+            stats = self.requests[key] = {
+                "calls": 0,
+                "retries": 0,
+                "coalesced": 0,
+                "queued": 0,
+                "shed": 0,
+                "statuses": {},
+                "queue_wait": Histogram(LATENCY_BUCKETS),
+                "latency": Histogram(LATENCY_BUCKETS),
+                "request_bytes": Histogram(SIZE_BUCKETS),
+                "response_bytes": Histogram(SIZE_BUCKETS),
+            }
+        return stats
+
+    def record_request(self, method: str, endpoint: str, status, duration: float,
+                       request_bytes: int = 0, response_bytes: int = 0):
+        """Record one backend call; status is the HTTP status code or "error" """
+        sampled = random.random() < self.sample_rate
+        with self._lock:
+            stats = self._request_stats(method, endpoint)
+            stats["calls"] += 1
+            stats["statuses"][str(status)] = stats["statuses"].get(str(status), 0) + 1
+            if sampled:
+                stats["latency"].observe(duration)
+                stats["request_bytes"].observe(request_bytes)
+                stats["response_bytes"].observe(response_bytes)
+
+    def record_retry(self, method: str, endpoint: str):
+        with self._lock:
+            self._request_stats(method, endpoint)["retries"] += 1
+
+    def record_coalesced(self, method: str, endpoint: str):
+        """Record a call answered by sharing an identical call already in flight"""
+        with self._lock:
+            self._request_stats(method, endpoint)["coalesced"] += 1
+
+    def record_queued(self, method: str, endpoint: str, wait: float):
+        """Record a call that waited `wait` seconds for an admission slot"""
+        sampled = random.random() < self.sample_rate
+        with self._lock:
+            stats = self._request_stats(method, endpoint)
+            stats["queued"] += 1
+            if sampled:
+                stats["queue_wait"].observe(wait)
+
+    def record_shed(self, method: str, endpoint: str):
+        """Record a call turned away because its endpoint's queue was full"""
+        with self._lock:
+            self._request_stats(method, endpoint)["shed"] += 1
+
+    def record_page(self, page: str, duration: float):
+        sampled = random.random() < self.sample_rate
+        with self._lock:
+            stats = self.pages.get(page)
+            if stats is None:
+                stats = self.pages[page] = {"renders": 0, "duration": Histogram(LATENCY_BUCKETS)}
+            stats["renders"] += 1
+            if sampled:
+                stats["duration"].observe(duration)
+
+    @contextmanager
+    def time_page(self, page: str):
+        """Time one render of a page, including renders cut short by st.rerun()"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_page(page, time.perf_counter() - start)
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable snapshot of every metric"""
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "sample_rate": self.sample_rate,
+                "requests": [
+                    {
+                        "method": method,
+                        "endpoint": endpoint,
+                        "calls": stats["calls"],
+                        "retries": stats["retries"],
+                        "coalesced": stats["coalesced"],
+                        "queued": stats["queued"],
+                        "shed": stats["shed"],
+                        "statuses": dict(stats["statuses"]),
+                        "queue_wait_seconds": stats["queue_wait"].to_dict(),
+                        "latency_seconds": stats["latency"].to_dict(),
+                        "request_bytes": stats["request_bytes"].to_dict(),
+                        "response_bytes": stats["response_bytes"].to_dict(),
+                    }
+                    for (method, endpoint), stats in sorted(self.requests.items())
+                ],
+                "pages": [
+                    {"page": page, "renders": stats["renders"], "duration_seconds": stats["duration"].to_dict()}
+                    for page, stats in sorted(self.pages.items())
+                ],
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format"""
+        lines = []
+
+        def histogram(name: str, help_text: str, series: List):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, hist in series:
+                cumulative = 0
+                for bound, count in zip([*map(str, hist.buckets), "+Inf"], hist.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f"{name}_sum{{{labels}}} {hist.sum}")
+                lines.append(f"{name}_count{{{labels}}} {hist.count}")
+
+        with self._lock:
+            requests = sorted(self.requests.items())
+            lines.append("# HELP backend_requests_total Backend calls by endpoint and status")
+            lines.append("# TYPE backend_requests_total counter")
+            for (method, endpoint), stats in requests:
+                for status, count in sorted(stats["statuses"].items()):
+                    lines.append(
+                        f'backend_requests_total{{method="{method}",endpoint="{endpoint}",status="{status}"}} {count}'
+                    )
+            lines.append("# HELP backend_retries_total Retried backend calls by endpoint")
+            lines.append("# TYPE backend_retries_total counter")
+            for (method, endpoint), stats in requests:
+                lines.append(f'backend_retries_total{{method="{method}",endpoint="{endpoint}"}} {stats["retries"]}')
+            lines.append("# HELP backend_coalesced_total Calls that shared an identical in-flight call, by endpoint")
+            lines.append("# TYPE backend_coalesced_total counter")
+            for (method, endpoint), stats in requests:
+                lines.append(f'backend_coalesced_total{{method="{method}",endpoint="{endpoint}"}} {stats["coalesced"]}')
+            lines.append("# HELP backend_queued_total Calls that waited for an admission slot, by endpoint")
+            lines.append("# TYPE backend_queued_total counter")
+            for (method, endpoint), stats in requests:
+                lines.append(f'backend_queued_total{{method="{method}",endpoint="{endpoint}"}} {stats["queued"]}')
+            lines.append("# HELP backend_shed_total Calls turned away with the admission queue full, by endpoint")
+            lines.append("# TYPE backend_shed_total counter")
+            for (method, endpoint), stats in requests:
+                lines.append(f'backend_shed_total{{method="{method}",endpoint="{endpoint}"}} {stats["shed"]}')
+
+            histogram("backend_request_duration_seconds", "Backend call latency (sampled)", [
+                (f'method="{method}",endpoint="{endpoint}"', stats["latency"]) for (method, endpoint), stats in requests
+            ])
+            histogram("backend_queue_wait_seconds", "Time calls waited for an admission slot (sampled)", [
+                (f'method="{method}",endpoint="{endpoint}"', stats["queue_wait"]) for (method, endpoint), stats in requests
+            ])
+            histogram("backend_request_size_bytes", "Backend request body size (sampled)", [
+                (f'method="{method}",endpoint="{endpoint}"', stats["request_bytes"]) for (method, endpoint), stats in requests
+            ])
+            histogram("backend_response_size_bytes", "Backend response body size (sampled)", [
+                (f'method="{method}",endpoint="{endpoint}"', stats["response_bytes"]) for (method, endpoint), stats in requests
+            ])
+
+            pages = sorted(self.pages.items())
+            lines.append("# HELP page_renders_total Page renders")
+            lines.append("# TYPE page_renders_total counter")
+            for page, stats in pages:
+                lines.append(f'page_renders_total{{page="{page}"}} {stats["renders"]}')
+            histogram("page_render_duration_seconds", "Page render time per rerun (sampled)", [
+                (f'page="{page}"', stats["duration"]) for page, stats in pages
+            ])
+        return "\n".join(lines) + "\n"
+
+
+def start_metrics_server(metrics: Metrics, port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Serve /metrics (Prometheus text) and /metrics.json on a background thread"""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path == "/metrics":
+                body, content_type = metrics.to_prometheus(), "text/plain; version=0.0.4"
+            elif self.path == "/metrics.json":
+                body, content_type = metrics.to_json(), "application/json"
+            else:
+                self.send_error(404)
+                return
+            payload = body.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
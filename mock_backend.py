@@ -0,0 +1,542 @@
+"""Local stand-in for the recruitment backend.
+
+Implements the endpoints the app calls with in-memory state, so the
+frontend can be exercised offline:
+
+    python mock_backend.py --port 8000
+    API_BASE_URL=http://127.0.0.1:8000 streamlit run app.py
+
+Every request can be delayed by a fixed latency and its response sent at a
+limited bandwidth, and the /__admin routes seed data and report call and
+byte counts for the benchmarks. With
+--cold-start the server behaves like a host that sleeps when idle: the
+first request after --idle-timeout seconds without any starts it, and until
+it is up requests are held, or answered with --waking-status if given.
+Like the hosted backend's proxy, it gzips large responses and takes gzipped
+request bodies, unless started with --no-gzip.
+"""
+import argparse
+import base64
+import gzip
+import hashlib
+import hmac
+import json
+import math
+import threading
+import time
+import uuid
+from email import policy
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from profile_delta import apply_delta, profile_digest
+
+# Responses at least this large are gzipped for clients that accept it
+GZIP_MIN_BYTES = 1024
+# Bytes written at a time when response bodies are sent at a limited bandwidth
+WRITE_CHUNK_SIZE = 64 * 1024
+
+
+def parse_multipart(content_type: str, body: bytes) -> List[Tuple[str, Optional[str], bytes]]:
+    """Split a multipart/form-data body into (field name, filename, content) parts"""
+    message = BytesParser(policy=policy.HTTP).parsebytes(
+        b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + body
+    )
+    return [
+        (part.get_param("name", header="content-disposition"), part.get_filename(), part.get_payload(decode=True))
+        for part in message.iter_parts()
+    ]
+
+
+def sample_resume(name: str) -> Dict:
+    """Parsed resume returned for every uploaded file"""
+    return {
+        "name": name,
+        "linkedin": f"https://www.linkedin.com/in/{name.lower().replace(' ', '-')}",
+        "github": f"https://github.com/{name.lower().replace(' ', '')}",
+        "skills": ["Python", "SQL", "Machine Learning"],
+        "total_years_of_experience": "3",
+        "education": [{
+            "institution": "State University",
+            "degree": "BSc Computer Science",
+            "GPA": "3.7",
+            "graduation": "2021",
+            "coursework": ["Algorithms", "Databases"]
+        }],
+        "experience": [{
+            "role": "Software Engineer",
+            "organization": "Acme",
+            "timeline": {"start": "2021", "end": "Present"},
+            "details": ["Built data pipelines", "Shipped ML features"],
+            "skills_related": ["Python", "SQL"]
+        }],
+        "accomplishments_and_projects": [{
+            "name": "Resume Ranker",
+            "skills_related": ["Python"],
+            "details": ["Ranked resumes against job postings"]
+        }]
+    }
+
+
+def match_score(*parts) -> int:
+    """Deterministic pseudo-random score between 40 and 99"""
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode()).digest()
+    return 40 + digest[0] % 60
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def encode_jwt(claims: Dict, secret: bytes) -> str:
+    """HS256 JWT, the shape of token the real backend issues"""
+    header = _b64url(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+    payload = _b64url(json.dumps(claims).encode())
+    signature = _b64url(hmac.new(secret, f"{header}.{payload}".encode(), hashlib.sha256).digest())
+    return f"{header}.{payload}.{signature}"
+
+
+class MockBackend:
+    """In-memory state behind the stand-in server"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = {}  # username -> {"user_id", "password", "role"}
+        self.tokens = {}  # token -> (username, expires_at)
+        self.token_ttl = 3600.0  # seconds an access token is valid
+        self.token_claims = True  # put user_id and role in tokens, False issues opaque tokens
+        self.secret = uuid.uuid4().bytes
+        self.profiles = {}  # user_id -> {"parsed_resume", "s3_link"}
+        self.resumes = {}  # resume_link -> parsed resume uploaded by recruiters
+        self.resume_digests = set()  # SHA-256 of every stored resume file
+        self.jobs = {}  # job_id -> {"user_id", "status", "result"}
+        self.job_duration = 2.0  # seconds a background match job takes
+        self.latency = 0.0  # seconds added to every API request
+        self.bandwidth = 0  # bytes per second response bodies are sent at, 0 for no limit
+        self.cold_start = 0.0  # seconds the host takes to start after sleeping, 0 never sleeps
+        self.idle_timeout = 900.0  # seconds without requests before the host sleeps
+        self.waking_status = None  # status answered while starting, None holds requests until up
+        self.gzip = True  # take gzipped request bodies and gzip large responses; False answers 415 to gzipped bodies
+        self.up_at = None  # when the host is (or will be) up, None while asleep
+        self.last_request_at = 0.0
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self.lock:
+            self.stats = {"calls": 0, "bytes_in": 0, "bytes_out": 0, "endpoints": {}}
+
+    def record_call(self, endpoint: str, bytes_in: int, bytes_out: int):
+        with self.lock:
+            self.stats["calls"] += 1
+            self.stats["bytes_in"] += bytes_in
+            self.stats["bytes_out"] += bytes_out
+            self.stats["endpoints"][endpoint] = self.stats["endpoints"].get(endpoint, 0) + 1
+
+    def wake(self) -> float:
+        """Seconds until the host is up, starting it if it is asleep"""
+        if not self.cold_start:
+            return 0.0
+        with self.lock:
+            now = time.time()
+            if self.up_at is None or (now >= self.up_at and now - self.last_request_at > self.idle_timeout):
+                self.up_at = now + self.cold_start
+            self.last_request_at = now
+            return max(0.0, self.up_at - now)
+
+    def create_user(self, username: str, password: str, role: str) -> str:
+        with self.lock:
+            user_id = f"user-{len(self.users) + 1}"
+            self.users[username] = {"user_id": user_id, "password": password, "role": role}
+            return self.issue_token(username)
+
+    def issue_token(self, username: str) -> str:
+        expires_at = time.time() + self.token_ttl
+        if self.token_claims:
+            user = self.users[username]
+            token = encode_jwt({
+                "sub": username,
+                "user_id": user["user_id"],
+                "role": user["role"],
+                "exp": int(expires_at),
+                "jti": uuid.uuid4().hex
+            }, self.secret)
+        else:
+            token = hashlib.sha256(f"{username}:{len(self.tokens)}".encode()).hexdigest()
+        self.tokens[token] = (username, expires_at)
+        return token
+
+    def username_for(self, token: Optional[str]) -> Optional[str]:
+        username, expires_at = self.tokens.get(token, (None, 0))
+        return username if expires_at > time.time() else None
+
+    def user_for(self, token: Optional[str]) -> Optional[Dict]:
+        username = self.username_for(token)
+        return self.users.get(username) if username else None
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    server_version = "MockBackend/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    @property
+    def backend(self) -> MockBackend:
+        return self.server.backend
+
+    def send_json(self, status: int, payload, headers: Optional[Dict] = None):
+        body = json.dumps(payload).encode()
+        headers = dict(headers or {})
+        if self.backend.gzip and len(body) >= GZIP_MIN_BYTES and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body, 6)
+            headers["Content-Encoding"] = "gzip"
+        self.bytes_out = len(body)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not self.backend.bandwidth:
+            self.wfile.write(body)
+            return
+        for start in range(0, len(body), WRITE_CHUNK_SIZE):
+            chunk = body[start:start + WRITE_CHUNK_SIZE]
+            self.wfile.write(chunk)
+            time.sleep(len(chunk) / self.backend.bandwidth)
+
+    def read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def bearer_token(self) -> Optional[str]:
+        auth = self.headers.get("Authorization", "")
+        return auth[len("Bearer "):] if auth.startswith("Bearer ") else None
+
+    def current_user(self) -> Optional[Dict]:
+        return self.backend.user_for(self.bearer_token())
+
+    def send_token(self, status: int, username: str):
+        self.send_json(status, {
+            "access_token": self.backend.issue_token(username),
+            "token_type": "bearer",
+            "expires_in": int(self.backend.token_ttl)
+        })
+
+    def dispatch(self):
+        url = urlsplit(self.path)
+        self.query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        self.body = self.read_body()
+        self.bytes_in = len(self.body)
+        self.bytes_out = 0
+        if url.path.startswith("/__admin/"):
+            route = ADMIN_ROUTES.get((self.command, url.path))
+            return route(self) if route else self.send_json(404, {"detail": "Not Found"})
+
+        endpoint = url.path
+        route = ROUTES.get((self.command, url.path))
+        if route is None:
+            # Routes ending in a path parameter, e.g. /recruiter/find_matches/jobs/{job_id}
+            prefix, _, self.path_param = url.path.rpartition("/")
+            route = PARAM_ROUTES.get((self.command, prefix))
+            endpoint = prefix + "/{id}"
+        waking = self.backend.wake()
+        if waking and self.backend.waking_status:
+            self.send_json(self.backend.waking_status, {"detail": "Service is starting"},
+                           headers={"Retry-After": str(math.ceil(waking))})
+            self.backend.record_call(f"{self.command} {endpoint}", self.bytes_in, self.bytes_out)
+            return
+        if waking or self.backend.latency:
+            time.sleep(waking + self.backend.latency)
+        if self.headers.get("Content-Encoding") == "gzip":
+            if not self.backend.gzip:
+                self.send_json(415, {"detail": "Unsupported Content-Encoding"})
+                self.backend.record_call(f"{self.command} {endpoint}", self.bytes_in, self.bytes_out)
+                return
+            self.body = gzip.decompress(self.body)
+        if route is None:
+            self.send_json(404, {"detail": "Not Found"})
+        else:
+            route(self)
+        self.backend.record_call(f"{self.command} {endpoint}", self.bytes_in, self.bytes_out)
+
+    do_GET = do_POST = do_PUT = do_PATCH = dispatch
+
+    def health(self):
+        self.send_json(200, {"status": "ok"})
+
+    # Auth
+    def token(self):
+        form = {key: values[-1] for key, values in parse_qs(self.body.decode()).items()}
+        user = self.backend.users.get(form.get("username"))
+        if user is None or user["password"] != form.get("password"):
+            return self.send_json(401, {"detail": "Incorrect username or password"})
+        self.send_token(200, form["username"])
+
+    def signup(self):
+        data = json.loads(self.body or b"{}")
+        if data.get("username") in self.backend.users:
+            return self.send_json(400, {"detail": "Username already registered"})
+        self.backend.create_user(data["username"], data["password"], data.get("role", "candidate"))
+        self.send_token(201, data["username"])
+
+    def refresh(self):
+        username = self.backend.username_for(self.bearer_token())
+        if username is None:
+            return self.send_json(401, {"detail": "Not authenticated"})
+        self.send_token(200, username)
+
+    def me(self):
+        user = self.current_user()
+        if user is None:
+            return self.send_json(401, {"detail": "Not authenticated"})
+        self.send_json(200, {"user_id": user["user_id"], "role": user["role"]})
+
+    # Candidate
+    def get_profile(self):
+        user = self.current_user()
+        if user is None:
+            return self.send_json(401, {"detail": "Not authenticated"})
+        profile = self.backend.profiles.get(user["user_id"])
+        if profile is None:
+            return self.send_json(404, {"detail": "Profile not found"})
+        self.send_json(200, profile)
+
+    def save_profile(self):
+        user = self.current_user()
+        if user is None:
+            return self.send_json(401, {"detail": "Not authenticated"})
+        data = json.loads(self.body)
+        with self.backend.lock:
+            self.backend.profiles[user["user_id"]] = {
+                "parsed_resume": data["parsed_resume"],
+                "s3_link": data.get("s3_link")
+            }
+        self.send_json(201, {"message": "Profile saved"})
+
+    def update_profile(self):
+        user = self.current_user()
+        if user is None:
+            return self.send_json(401, {"detail": "Not authenticated"})
+        if user["user_id"] not in self.backend.profiles:
+            return self.send_json(404, {"detail": "Profile not found"})
+        return self.save_profile()
+
+    def patch_profile(self):
+        user = self.current_user()
+        if user is None:
+            return self.send_json(401, {"detail": "Not authenticated"})
+        data = json.loads(self.body)
+        with self.backend.lock:
+            profile = self.backend.profiles.get(user["user_id"])
+            if profile is None:
+                return self.send_json(404, {"detail": "Profile not found"})
+            if data.get("base_digest") != profile_digest(profile["parsed_resume"]):
+                return self.send_json(409, {"detail": "Profile changed since it was loaded"})
+            profile["parsed_resume"] = apply_delta(profile["parsed_resume"], data["parsed_resume"])
+            if "s3_link" in data:
+                profile["s3_link"] = data["s3_link"]
+        self.send_json(200, {"message": "Profile updated"})
+
+    def parse_resume(self):
+        user = self.current_user()
+        if user is None:
+            return self.send_json(401, {"detail": "Not authenticated"})
+        parts = parse_multipart(self.headers["Content-Type"], self.body)
+        filename = next((filename for _, filename, _ in parts if filename), "resume.pdf")
+        self.send_json(200, {
+            "parsed_resume": sample_resume("Mock Candidate"),
+            "s3_link": f"https://mock-bucket.local/{user['user_id']}/{filename}"
+        })
+
+    def match_with_job(self):
+        user = self.current_user()
+        if user is None:
+            return self.send_json(401, {"detail": "Not authenticated"})
+        self.send_json(200, match_score(user["user_id"], self.query.get("job_link"), self.query.get("match_criteria")))
+
+    # Recruiter
+    def score_resumes(self) -> List[Dict]:
+        """Store the uploaded resumes and score them, plus stored ones if asked, against the job"""
+        resumes = {}
+        if self.query.get("include_existing_resumes", "true").lower() == "true":
+            resumes.update(self.backend.resumes)
+        if self.body:
+            for field, filename, content in parse_multipart(self.headers["Content-Type"], self.body):
+                if field != "resume_files":
+                    continue
+                digest = hashlib.sha256(content).hexdigest()
+                resume_link = f"https://mock-bucket.local/resumes/{digest}.pdf"
+                resumes[resume_link] = sample_resume(filename.rsplit(".", 1)[0])
+                with self.backend.lock:
+                    self.backend.resumes[resume_link] = resumes[resume_link]
+                    self.backend.resume_digests.add(digest)
+        job_link = self.query.get("job_link")
+        matches = [
+            {"match_score": match_score(resume_link, job_link), "resume_link": resume_link, "user_profile": profile}
+            for resume_link, profile in resumes.items()
+        ]
+        matches.sort(key=lambda match: match["match_score"], reverse=True)
+        return matches
+
+    def find_matches(self):
+        user = self.current_user()
+        if user is None or user["role"] != "recruiter":
+            return self.send_json(401, {"detail": "Not authenticated"})
+        self.send_json(200, self.score_resumes())
+
+    def submit_match_job(self):
+        user = self.current_user()
+        if user is None or user["role"] != "recruiter":
+            return self.send_json(401, {"detail": "Not authenticated"})
+        matches = self.score_resumes()
+        job_id = uuid.uuid4().hex
+        job = {"user_id": user["user_id"], "status": "running", "result": None}
+        self.backend.jobs[job_id] = job
+
+        def finish():
+            time.sleep(self.backend.job_duration)
+            job["result"] = matches
+            job["status"] = "done"
+
+        threading.Thread(target=finish, daemon=True).start()
+        self.send_json(202, {"job_id": job_id})
+
+    def match_job_status(self):
+        user = self.current_user()
+        if user is None or user["role"] != "recruiter":
+            return self.send_json(401, {"detail": "Not authenticated"})
+        job = self.backend.jobs.get(self.path_param)
+        if job is None or job["user_id"] != user["user_id"]:
+            return self.send_json(404, {"detail": "Job not found"})
+        self.send_json(200, {"status": job["status"], "result": job["result"]})
+
+    def resume_hashes(self):
+        user = self.current_user()
+        if user is None or user["role"] != "recruiter":
+            return self.send_json(401, {"detail": "Not authenticated"})
+        self.send_json(200, sorted(self.backend.resume_digests))
+
+    # Admin, for benchmarks and local setup
+    def admin_stats(self):
+        self.send_json(200, self.backend.stats)
+
+    def admin_reset_stats(self):
+        self.backend.reset_stats()
+        self.send_json(200, {"message": "Stats reset"})
+
+    def admin_sleep(self):
+        """Put the host to sleep, so the next request has to start it.
+
+        Body (optional): {"cold_start": seconds the start takes}
+        """
+        data = json.loads(self.body) if self.body else {}
+        with self.backend.lock:
+            self.backend.cold_start = data.get("cold_start", self.backend.cold_start)
+            self.backend.up_at = None
+        self.send_json(200, {"message": "Asleep"})
+
+    def admin_seed(self):
+        """Create users with optional profiles and store recruiter resumes.
+
+        Body: {"users": [{"username", "password", "role", "profile"}], "resumes": [parsed resume, ...]}
+        """
+        data = json.loads(self.body)
+        users = {}
+        for user in data.get("users", []):
+            token = self.backend.create_user(user["username"], user["password"], user["role"])
+            user_id = self.backend.users[user["username"]]["user_id"]
+            if user.get("profile"):
+                self.backend.profiles[user_id] = user["profile"]
+            users[user["username"]] = {"user_id": user_id, "token": token}
+        for index, resume in enumerate(data.get("resumes", [])):
+            digest = hashlib.sha256(f"seeded-{index}".encode()).hexdigest()
+            self.backend.resumes[f"https://mock-bucket.local/resumes/{digest}.pdf"] = resume
+            self.backend.resume_digests.add(digest)
+        self.send_json(200, {"users": users})
+
+
+ROUTES = {
+    ("GET", "/"): MockHandler.health,
+    ("POST", "/token"): MockHandler.token,
+    ("POST", "/signup"): MockHandler.signup,
+    ("GET", "/me"): MockHandler.me,
+    ("POST", "/refresh"): MockHandler.refresh,
+    ("GET", "/candidate/get_profile"): MockHandler.get_profile,
+    ("POST", "/candidate/save_profile"): MockHandler.save_profile,
+    ("PUT", "/candidate/update_profile"): MockHandler.update_profile,
+    ("PATCH", "/candidate/update_profile"): MockHandler.patch_profile,
+    ("POST", "/candidate/parse_resume"): MockHandler.parse_resume,
+    ("GET", "/candidate/match_with_job"): MockHandler.match_with_job,
+    ("POST", "/recruiter/find_matches"): MockHandler.find_matches,
+    ("GET", "/recruiter/resume_hashes"): MockHandler.resume_hashes,
+    ("POST", "/recruiter/find_matches/jobs"): MockHandler.submit_match_job,
+}
+
+PARAM_ROUTES = {
+    ("GET", "/recruiter/find_matches/jobs"): MockHandler.match_job_status,
+}
+
+ADMIN_ROUTES = {
+    ("GET", "/__admin/stats"): MockHandler.admin_stats,
+    ("POST", "/__admin/reset_stats"): MockHandler.admin_reset_stats,
+    ("POST", "/__admin/seed"): MockHandler.admin_seed,
+    ("POST", "/__admin/sleep"): MockHandler.admin_sleep,
+}
+
+
+def start_server(host: str = "127.0.0.1", port: int = 0, verbose: bool = False) -> ThreadingHTTPServer:
+    """Start the stand-in on a background thread; port 0 picks a free port"""
+    server = ThreadingHTTPServer((host, port), MockHandler)
+    server.backend = MockBackend()
+    server.verbose = verbose
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the recruitment backend")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--job-duration", type=float, default=2.0,
+                        help="Seconds a background match job takes to finish")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Seconds added to every API request")
+    parser.add_argument("--bandwidth", type=float, default=0,
+                        help="Bytes per second response bodies are sent at, 0 for no limit")
+    parser.add_argument("--token-ttl", type=float, default=3600.0,
+                        help="Seconds an access token is valid")
+    parser.add_argument("--opaque-tokens", action="store_true",
+                        help="Issue tokens without identity claims, so the app has to call /me")
+    parser.add_argument("--cold-start", type=float, default=0.0,
+                        help="Seconds the host takes to start after sleeping, 0 never sleeps")
+    parser.add_argument("--idle-timeout", type=float, default=900.0,
+                        help="Seconds without requests before the host sleeps")
+    parser.add_argument("--waking-status", type=int,
+                        help="Answer requests with this status (e.g. 503) while starting instead of holding them")
+    parser.add_argument("--no-gzip", action="store_true",
+                        help="Answer gzipped request bodies with 415 and never gzip responses")
+    parser.add_argument("--quiet", action="store_true", help="Do not log requests")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), MockHandler)
+    server.backend = MockBackend()
+    server.backend.job_duration = args.job_duration
+    server.backend.latency = args.latency
+    server.backend.bandwidth = args.bandwidth
+    server.backend.token_ttl = args.token_ttl
+    server.backend.token_claims = not args.opaque_tokens
+    server.backend.cold_start = args.cold_start
+    server.backend.idle_timeout = args.idle_timeout
+    server.backend.waking_status = args.waking_status
+    server.backend.gzip = not args.no_gzip
+    server.verbose = not args.quiet
+    print(f"Mock backend listening on http://{args.host}:{args.port}", flush=True)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""Local stand-in for a Redis server, for trying the shared state store offline.
+
+Speaks just enough of the Redis protocol for RedisStore, keeping strings
+and sorted sets in memory with their expiry times:
+
+    python mock_redis.py --port 6380
+    STATE_STORE_URL=redis://127.0.0.1:6380/0 streamlit run app.py
+
+Start two apps on different ports against it to see sessions and caches
+shared between replicas.
+"""
+import argparse
+import re
+import socketserver
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+def glob_to_regex(pattern: str) -> "re.Pattern":
+    """Redis' glob syntax: * ? [...] and backslash escapes"""
+    regex, i = "", 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\" and i + 1 < len(pattern):
+            i += 1
+            regex += re.escape(pattern[i])
+        elif char == "*":
+            regex += ".*"
+        elif char == "?":
+            regex += "."
+        elif char == "[" and "]" in pattern[i + 1:]:
+            end = pattern.index("]", i + 1)
+            body = pattern[i + 1:end]
+            regex += "[" + ("^" + body[1:] if body.startswith("^") else body) + "]"
+            i = end
+        else:
+            regex += re.escape(char)
+        i += 1
+    return re.compile(regex, re.DOTALL)
+
+
+class MockRedis:
+    """Keys, values and expiry times behind the stand-in server, one dict per database"""
+
+    def __init__(self, password: Optional[str] = None):
+        self.lock = threading.Lock()
+        self.password = password
+        self.databases: Dict[int, Dict[bytes, Tuple[bytes, Optional[float]]]] = {}
+        self.commands = 0
+
+    def data(self, db: int) -> Dict[bytes, Tuple[bytes, Optional[float]]]:
+        data = self.databases.setdefault(db, {})
+        now = time.monotonic()
+        for key in [key for key, (_, expires_at) in data.items() if expires_at is not None and expires_at <= now]:
+            del data[key]
+        return data
+
+
+class RedisError(Exception):
+    pass
+
+
+class WrongType(RedisError):
+    def __init__(self):
+        super().__init__("WRONGTYPE Operation against a key holding the wrong kind of value")
+
+
+class MockRedisHandler(socketserver.StreamRequestHandler):
+    def setup(self):
+        super().setup()
+        self.db = 0
+        self.authenticated = self.server.redis.password is None
+
+    @property
+    def redis(self) -> MockRedis:
+        return self.server.redis
+
+    def read_command(self) -> Optional[List[bytes]]:
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            return line.split()  # inline command, e.g. from telnet
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def encode(self, reply) -> bytes:
+        if isinstance(reply, RedisError):
+            return b"-ERR %s\r\n" % str(reply).encode()
+        if isinstance(reply, str):
+            return b"+%s\r\n" % reply.encode()
+        if isinstance(reply, int):
+            return b":%d\r\n" % reply
+        if reply is None:
+            return b"$-1\r\n"
+        if isinstance(reply, bytes):
+            return b"$%d\r\n%s\r\n" % (len(reply), reply)
+        return b"*%d\r\n" % len(reply) + b"".join(self.encode(item) for item in reply)
+
+    def handle(self):
+        while True:
+            args = self.read_command()
+            if args is None:
+                return
+            if not args:
+                continue
+            try:
+                reply = self.execute(args[0].upper().decode(), args[1:])
+            except RedisError as e:
+                reply = e
+            except (ValueError, IndexError):
+                reply = RedisError("syntax error")
+            self.wfile.write(self.encode(reply))
+
+    def execute(self, name: str, args: List[bytes]):
+        if name == "PING":
+            return "PONG"
+        if name == "AUTH":
+            if args[-1].decode() != self.redis.password:
+                raise RedisError("invalid password")
+            self.authenticated = True
+            return "OK"
+        if not self.authenticated:
+            raise RedisError("NOAUTH Authentication required.")
+        if name == "SELECT":
+            self.db = int(args[0])
+            return "OK"
+
+        with self.redis.lock:
+            self.redis.commands += 1
+            data = self.redis.data(self.db)
+            if name == "GET":
+                entry = data.get(args[0])
+                if entry is not None and not isinstance(entry[0], bytes):
+                    raise WrongType()
+                return entry[0] if entry is not None else None
+            if name == "SET":
+                key, value, options = args[0], args[1], [arg.upper() for arg in args[2:]]
+                expires_at = None
+                if b"EX" in options:
+                    expires_at = time.monotonic() + int(args[2 + options.index(b"EX") + 1])
+                if b"PX" in options:
+                    expires_at = time.monotonic() + int(args[2 + options.index(b"PX") + 1]) / 1000
+                data[key] = (value, expires_at)
+                return "OK"
+            if name == "DEL":
+                return sum(data.pop(key, None) is not None for key in args)
+            if name == "SCAN":
+                # Every match in one pass, cursor 0 ends the iteration
+                options = [arg.upper() for arg in args[1:]]
+                pattern = args[1 + options.index(b"MATCH") + 1] if b"MATCH" in options else b"*"
+                regex = glob_to_regex(pattern.decode())
+                return [b"0", [key for key in data if regex.fullmatch(key.decode())]]
+            if name.startswith("Z"):
+                return self.sorted_set_command(name, args, data)
+            if name == "DBSIZE":
+                return len(data)
+            if name == "FLUSHDB":
+                data.clear()
+                return "OK"
+        raise RedisError(f"unknown command '{name}'")
+
+
+    def sorted_set_command(self, name: str, args: List[bytes], data: Dict):
+        """ZADD, ZREM, ZCARD, ZRANGE and ZREMRANGEBYSCORE on a dict of member -> score"""
+        entry = data.get(args[0])
+        if entry is not None and not isinstance(entry[0], dict):
+            raise WrongType()
+        members = entry[0] if entry is not None else {}
+        if name == "ZADD":
+            pairs = list(zip(args[1::2], args[2::2]))
+            added = sum(member not in members for _, member in pairs)
+            members.update((member, float(score)) for score, member in pairs)
+            data[args[0]] = (members, None)
+            return added
+        ordered = sorted(members, key=lambda member: (members[member], member))
+        if name == "ZCARD":
+            return len(members)
+        if name == "ZRANGE":
+            start, stop = int(args[1]), int(args[2])
+            return ordered[start:len(ordered) if stop == -1 else stop + 1]
+        if name == "ZREM":
+            removed = [member for member in args[1:] if members.pop(member, None) is not None]
+        elif name == "ZREMRANGEBYSCORE":
+            low, high = (float(bound) for bound in args[1:3])
+            removed = [member for member in ordered if low <= members[member] <= high]
+            for member in removed:
+                del members[member]
+        else:
+            raise RedisError(f"unknown command '{name}'")
+        if not members:
+            data.pop(args[0], None)
+        return len(removed)
+
+
+class MockRedisServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stand-in for a Redis server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6380)
+    parser.add_argument("--password", help="Require clients to AUTH with this password")
+    args = parser.parse_args()
+
+    server = MockRedisServer((args.host, args.port), MockRedisHandler)
+    server.redis = MockRedis(args.password)
+    print(f"Mock Redis listening on redis://{args.host}:{args.port}/0", flush=True)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
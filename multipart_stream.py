@@ -0,0 +1,86 @@
+import uuid
+from typing import Any, Iterator, List, Optional, Tuple
+
+# Size of each slice of file content handed to the socket
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class UploadTooLarge(ValueError):
+    """Raised when an upload would exceed the per-request memory ceiling"""
+
+
+def upload_size(file: Any) -> int:
+    """Size in bytes of an in-memory upload such as a Streamlit UploadedFile"""
+    return file.getbuffer().nbytes
+
+
+def _quote(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', "%22").replace("\r", "%0D").replace("\n", "%0A")
+
+
+class MultipartStream:
+    """multipart/form-data body streamed straight out of in-memory upload buffers.
+
+    File content is sliced from each buffer as memoryviews, so nothing is
+    copied. The body knows its length, so requests sends it with a
+    Content-Length header, and it can be iterated again if a request is retried.
+    """
+
+    def __init__(self, parts: List[Tuple[str, str, Any, str]], max_bytes: Optional[int] = None,
+                 chunk_size: int = STREAM_CHUNK_SIZE):
+        """parts are (field name, filename, file object with getbuffer(), content type)"""
+        self.boundary = uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        self._parts = [
+            (self._part_header(field, filename, content_type), file)
+            for field, filename, file, content_type in parts
+        ]
+        self._closing = f"--{self.boundary}--\r\n".encode()
+        self.payload_bytes = sum(upload_size(file) for _, file in self._parts)
+        if max_bytes is not None and self.payload_bytes > max_bytes:
+            raise UploadTooLarge(
+                f"Upload of {self.payload_bytes / 2**20:.1f} MB exceeds the "
+                f"{max_bytes / 2**20:.0f} MB per-request limit"
+            )
+
+    def _part_header(self, field: str, filename: str, content_type: str) -> bytes:
+        return (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{_quote(field)}"; filename="{_quote(filename)}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode()
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        framing = sum(len(header) + 2 for header, _ in self._parts) + len(self._closing)
+        return framing + self.payload_bytes
+
+    def __iter__(self) -> Iterator:
+        for header, file in self._parts:
+            yield header
+            buffer = file.getbuffer()
+            for offset in range(0, buffer.nbytes, self.chunk_size):
+                yield buffer[offset:offset + self.chunk_size]
+            yield b"\r\n"
+        yield self._closing
+
+
+def chunk_uploads(files: List, max_files: int, max_bytes: int) -> List[List]:
+    """Split uploads into consecutive chunks of at most max_files files and max_bytes bytes"""
+    chunks = []
+    chunk = []
+    chunk_bytes = 0
+    for file in files:
+        size = upload_size(file)
+        if chunk and (len(chunk) >= max_files or chunk_bytes + size > max_bytes):
+            chunks.append(chunk)
+            chunk = []
+            chunk_bytes = 0
+        chunk.append(file)
+        chunk_bytes += size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
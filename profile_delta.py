@@ -0,0 +1,71 @@
+import copy
+import hashlib
+import json
+from difflib import SequenceMatcher
+from typing import Any, Dict, List
+
+# Sections of the parsed resume that are lists of entries
+LIST_FIELDS = ("education", "experience", "accomplishments_and_projects")
+
+
+def _fingerprint(value: Any) -> str:
+    return json.dumps(value, sort_keys=True)
+
+
+def profile_digest(parsed_resume: Dict) -> str:
+    """Digest of a parsed resume, used to check that a delta applies to the right base"""
+    return hashlib.sha256(_fingerprint(parsed_resume).encode()).hexdigest()
+
+
+def diff_list(old: List, new: List) -> List[Dict]:
+    """Describe how to turn one list into another as splices against the old list.
+
+    Each splice replaces `delete` entries starting at `index` with `insert`.
+    Indices refer to the old list, so splices must be applied from last to first.
+    """
+    matcher = SequenceMatcher(
+        a=[_fingerprint(entry) for entry in old],
+        b=[_fingerprint(entry) for entry in new],
+        autojunk=False
+    )
+    return [
+        {"index": i1, "delete": i2 - i1, "insert": new[j1:j2]}
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def diff_profile(old: Dict, new: Dict) -> Dict:
+    """Compute the delta that turns the old parsed resume into the new one.
+
+    Only fields present in the new profile are compared, so fields the form
+    does not manage are left alone. Changed scalar fields go under "set" and
+    changed list sections under "splice".
+    """
+    delta = {"set": {}, "splice": {}}
+    for field, value in new.items():
+        if field in LIST_FIELDS:
+            splices = diff_list(old.get(field) or [], value or [])
+            if splices:
+                delta["splice"][field] = splices
+        elif old.get(field) != value:
+            delta["set"][field] = value
+    return delta
+
+
+def is_empty(delta: Dict) -> bool:
+    """Check whether a delta changes nothing"""
+    return not delta["set"] and not delta["splice"]
+
+
+def apply_delta(parsed_resume: Dict, delta: Dict) -> Dict:
+    """Apply a delta from diff_profile, returning a new parsed resume"""
+    result = copy.deepcopy(parsed_resume)
+    result.update(delta.get("set", {}))
+    for field, splices in delta.get("splice", {}).items():
+        entries = list(result.get(field) or [])
+        for splice in reversed(splices):
+            index = splice["index"]
+            entries[index:index + splice["delete"]] = splice["insert"]
+        result[field] = entries
+    return result
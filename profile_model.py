@@ -0,0 +1,149 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+def _strings(values) -> List[str]:
+    return list(values) if values else []
+
+
+@dataclass(slots=True)
+class Education:
+    institution: Optional[str] = ""
+    degree: Optional[str] = ""
+    GPA: Optional[str] = ""
+    graduation: Optional[str] = ""
+    coursework: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_api(cls, data: Dict) -> "Education":
+        return cls(
+            institution=data.get("institution", ""),
+            degree=data.get("degree", ""),
+            GPA=data.get("GPA", ""),
+            graduation=data.get("graduation", ""),
+            coursework=_strings(data.get("coursework")),
+        )
+
+    def to_api(self) -> Dict:
+        return {
+            "institution": self.institution,
+            "degree": self.degree,
+            "GPA": self.GPA,
+            "graduation": self.graduation,
+            "coursework": list(self.coursework),
+        }
+
+
+@dataclass(slots=True)
+class Experience:
+    role: Optional[str] = ""
+    organization: Optional[str] = ""
+    start: Optional[str] = ""
+    end: Optional[str] = ""
+    details: List[str] = field(default_factory=list)
+    skills_related: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_api(cls, data: Dict) -> "Experience":
+        timeline = data.get("timeline") or {}
+        return cls(
+            role=data.get("role", ""),
+            organization=data.get("organization", ""),
+            start=timeline.get("start", ""),
+            end=timeline.get("end", ""),
+            details=_strings(data.get("details")),
+            skills_related=_strings(data.get("skills_related")),
+        )
+
+    def to_api(self) -> Dict:
+        return {
+            "role": self.role,
+            "organization": self.organization,
+            "timeline": {"start": self.start, "end": self.end},
+            "details": list(self.details),
+            "skills_related": list(self.skills_related),
+        }
+
+
+@dataclass(slots=True)
+class Project:
+    name: Optional[str] = ""
+    skills_related: List[str] = field(default_factory=list)
+    details: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_api(cls, data: Dict) -> "Project":
+        return cls(
+            name=data.get("name", ""),
+            skills_related=_strings(data.get("skills_related")),
+            details=_strings(data.get("details")),
+        )
+
+    def to_api(self) -> Dict:
+        return {
+            "name": self.name,
+            "skills_related": list(self.skills_related),
+            "details": list(self.details),
+        }
+
+
+@dataclass(slots=True)
+class Profile:
+    """A candidate profile as edited in one session.
+
+    A new profile starts with one blank entry per section so the editor has
+    a form to fill in.
+    """
+    name: Optional[str] = None
+    linkedin: Optional[str] = None
+    github: Optional[str] = None
+    total_years_of_experience: Optional[str] = None
+    skills: List[str] = field(default_factory=list)
+    education: List[Education] = field(default_factory=lambda: [Education()])
+    experience: List[Experience] = field(default_factory=lambda: [Experience()])
+    projects: List[Project] = field(default_factory=lambda: [Project()])
+    s3_link: Optional[str] = None
+
+    @classmethod
+    def from_api(cls, data: Dict) -> "Profile":
+        """Parse the backend's {"parsed_resume", "s3_link"} JSON"""
+        profile = cls()
+        profile.update_from_api(data)
+        return profile
+
+    def update_from_api(self, data: Dict):
+        """Take every field the backend JSON has a value for, keeping the others"""
+        resume = data.get("parsed_resume") or {}
+        if resume.get("name"):
+            self.name = resume["name"]
+        if resume.get("linkedin"):
+            self.linkedin = resume["linkedin"]
+        if resume.get("github"):
+            self.github = resume["github"]
+        if resume.get("total_years_of_experience"):
+            self.total_years_of_experience = resume["total_years_of_experience"]
+        if resume.get("skills"):
+            self.skills = list(resume["skills"])
+        if resume.get("education"):
+            self.education = [Education.from_api(entry) for entry in resume["education"]]
+        if resume.get("experience"):
+            self.experience = [Experience.from_api(entry) for entry in resume["experience"]]
+        if resume.get("accomplishments_and_projects"):
+            self.projects = [Project.from_api(entry) for entry in resume["accomplishments_and_projects"]]
+        self.s3_link = data.get("s3_link") or None
+
+    def to_api(self) -> Dict:
+        """Serialize to the JSON the backend's save and update endpoints take"""
+        return {
+            "parsed_resume": {
+                "name": self.name,
+                "linkedin": self.linkedin,
+                "github": self.github,
+                "skills": list(self.skills),
+                "education": [entry.to_api() for entry in self.education],
+                "experience": [entry.to_api() for entry in self.experience],
+                "accomplishments_and_projects": [entry.to_api() for entry in self.projects],
+                "total_years_of_experience": self.total_years_of_experience,
+            },
+            "s3_link": self.s3_link,
+        }
@@ -0,0 +1,152 @@
+"""Retry backoff, a circuit breaker and a warm-up ping for a backend that sleeps when idle.
+
+The backend host is stopped after a quiet spell and takes a while to start
+again. The warm-up ping starts it before the user needs it. Idempotent calls
+that cannot connect, or that the load balancer answers with a 502, 503 or
+504 while the host starts, are retried after a jittered, exponentially
+growing delay. Calls that keep failing open the circuit breaker, which then
+fails further calls at once instead of leaving every user waiting on
+timeouts, and lets a single trial call through once the backend has had
+time to recover.
+"""
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How many times, and how far apart, a failed idempotent call is made"""
+    attempts: int = 3  # calls in total, the first included
+    base_delay: float = 0.5  # seconds
+    max_delay: float = 8.0
+
+    def delay(self, retry: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to wait before the given retry, counted from 1.
+
+        Full jitter: a uniform pick below a cap that doubles each retry, so
+        sessions retrying together spread out. A Retry-After from the server
+        raises the wait, up to max_delay.
+        """
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (retry - 1)))
+        if retry_after:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """A Retry-After header given in seconds; HTTP dates are ignored"""
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        return None
+
+
+class CircuitOpen(Exception):
+    """Raised instead of calling a backend the breaker has given up on for now"""
+
+    def __init__(self, retry_in: float):
+        self.retry_in = retry_in
+        super().__init__(
+            f"The backend is not responding, please try again in {max(1, round(retry_in))} seconds"
+        )
+
+
+class CircuitBreaker:
+    """Thread-safe breaker shared by every call to one backend.
+
+    Closed, it lets calls through and counts consecutive failures. After
+    `threshold` of them it opens and rejects calls for `reset_timeout`
+    seconds, then lets one trial call through: success closes it again,
+    failure reopens it for another `reset_timeout`.
+    """
+
+    def __init__(self, threshold: int = 5, reset_timeout: float = 30.0):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None  # time.monotonic() when last opened
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            if time.monotonic() - self.opened_at < self.reset_timeout or self._trial_running:
+                return "open"
+            return "half-open"
+
+    def before_call(self):
+        """Raise CircuitOpen unless a call may go ahead now"""
+        with self._lock:
+            if self.opened_at is None:
+                return
+            remaining = self.opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0 or self._trial_running:
+                raise CircuitOpen(max(remaining, 0.0))
+            self._trial_running = True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_running or (self.opened_at is None and self.failures >= self.threshold):
+                self.opened_at = time.monotonic()
+            self._trial_running = False
+
+    def release(self):
+        """End a call that neither proved nor disproved the backend is up, e.g. a read timeout"""
+        with self._lock:
+            self._trial_running = False
+
+
+class Warmup:
+    """Pings the backend on a background thread so a sleeping host starts early.
+
+    `ping` returns whether the backend answered. A ping is not sent while
+    another is running, nor within `interval` seconds of one that succeeded.
+    """
+
+    def __init__(self, ping: Callable[[], bool], interval: float = 60.0):
+        self.ping = ping
+        self.interval = interval
+        self._lock = threading.Lock()
+        self.started_at = None  # time.monotonic() of the running ping
+        self.succeeded_at = None  # time.monotonic() of the last successful ping
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds the running ping has been waiting, 0 when none is running"""
+        started_at = self.started_at
+        return time.monotonic() - started_at if started_at is not None else 0.0
+
+    def trigger(self) -> bool:
+        """Start a ping unless one is running or recently succeeded; never blocks"""
+        with self._lock:
+            now = time.monotonic()
+            if self.started_at is not None:
+                return False
+            if self.succeeded_at is not None and now - self.succeeded_at < self.interval:
+                return False
+            self.started_at = now
+        threading.Thread(target=self._run, daemon=True).start()
+        return True
+
+    def _run(self):
+        try:
+            answered = self.ping()
+        except Exception:
+            answered = False
+        with self._lock:
+            if answered:
+                self.succeeded_at = time.monotonic()
+            self.started_at = None
@@ -0,0 +1,58 @@
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Set, Tuple
+
+from caching import content_digest
+
+PDF_HEADER = b"%PDF-"
+PDF_TRAILER = b"%%EOF"
+# Readers accept the header and trailer anywhere within this many bytes of either end
+PDF_MARKER_WINDOW = 1024
+
+
+def pdf_problem(data) -> Optional[str]:
+    """Reason a buffer is not a complete PDF, or None if it looks valid"""
+    if len(data) == 0:
+        return "file is empty"
+    if PDF_HEADER not in bytes(data[:PDF_MARKER_WINDOW]):
+        return "not a PDF file"
+    if PDF_TRAILER not in bytes(data[-PDF_MARKER_WINDOW:]):
+        return "PDF is truncated or corrupt"
+    return None
+
+
+@dataclass
+class ResumeBatch:
+    """Outcome of screening an upload batch before it is sent for matching"""
+    files: List[Any] = field(default_factory=list)
+    digests: List[str] = field(default_factory=list)
+    duplicates: List[Tuple[Any, Any]] = field(default_factory=list)  # (duplicate, first upload)
+    rejected: List[Tuple[Any, str]] = field(default_factory=list)  # (file, reason)
+    existing: List[Any] = field(default_factory=list)
+
+
+def screen_resumes(uploaded_files: List, existing_digests: Optional[Set[str]] = None) -> ResumeBatch:
+    """Validate and deduplicate uploaded resumes by content hash.
+
+    Files that are not valid PDFs are rejected, repeats of an earlier file in
+    the batch are dropped, and files whose hash is in existing_digests (resumes
+    already stored by the backend) are set aside.
+    """
+    batch = ResumeBatch()
+    first_upload = {}
+    for file in uploaded_files:
+        with file.getbuffer() as data:
+            problem = pdf_problem(data)
+            digest = content_digest(data) if problem is None else None
+
+        if problem is not None:
+            batch.rejected.append((file, problem))
+        elif digest in first_upload:
+            batch.duplicates.append((file, first_upload[digest]))
+        elif existing_digests and digest in existing_digests:
+            first_upload[digest] = file
+            batch.existing.append(file)
+        else:
+            first_upload[digest] = file
+            batch.files.append(file)
+            batch.digests.append(digest)
+    return batch
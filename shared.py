@@ -0,0 +1,996 @@
+"""Configuration, backend client, caches and session helpers shared by every page.
+
+app.py routes to the page scripts in views/ with st.navigation. Only the page
+being shown is run, so each page imports what it needs itself and this module
+stays light enough for the login page's first paint.
+"""
+import streamlit as st
+import requests
+from requests.adapters import HTTPAdapter
+from http.cookiejar import DefaultCookiePolicy
+import gzip
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Any, Union
+
+from auth_tokens import decode_claims, identity_from_claims, token_expiry
+from admission import AdmissionController, Overloaded
+from caching import DiskCache, TTLCache, content_digest
+from json_codec import ArrayDecoder, dumps, response_json
+from metrics import Metrics, endpoint_label, start_metrics_server
+from multipart_stream import MultipartStream
+from profile_model import Profile
+from resilience import CircuitBreaker, RetryPolicy, Warmup, retry_after_seconds
+from single_flight import SingleFlight
+from state_store import StateStore, StoreCache, open_store
+
+# API Base URL
+API_BASE_URL = os.environ.get("API_BASE_URL", "https://ai-driven-recruitment.onrender.com")
+
+# Instrumentation: fraction of latency/size observations kept, optional /metrics
+# port, and whether the admin debug panel is shown
+METRICS_SAMPLE_RATE = float(os.environ.get("METRICS_SAMPLE_RATE", "1.0"))
+METRICS_PORT = os.environ.get("METRICS_PORT")
+ADMIN_DEBUG = os.environ.get("ADMIN_DEBUG") == "1"
+
+# HTTP connection pool settings for the shared backend session
+HTTP_POOL_CONNECTIONS = 4
+HTTP_POOL_MAXSIZE = 32
+
+# (connect, read) timeouts in seconds, per endpoint
+DEFAULT_TIMEOUT = (5, 60)
+ENDPOINT_TIMEOUTS = {
+    "/token": (5, 60),
+    "/signup": (5, 60),
+    "/me": (5, 30),
+    "/candidate/get_profile": (5, 30),
+    "/candidate/save_profile": (5, 60),
+    "/candidate/update_profile": (5, 60),
+    "/candidate/parse_resume": (5, 180),
+    "/candidate/match_with_job": (5, 180),
+    "/recruiter/find_matches": (5, 600),
+}
+
+# JSON request bodies to these endpoints are gzipped once they reach GZIP_MIN_BYTES,
+# if GZIP_REQUESTS=1 says the backend accepts Content-Encoding: gzip (a 415 turns
+# it off again). Responses are always accepted gzipped.
+GZIP_REQUESTS = os.environ.get("GZIP_REQUESTS") == "1"
+GZIP_REQUEST_ENDPOINTS = ("/candidate/save_profile", "/candidate/update_profile")
+GZIP_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+
+# Bytes read at a time from a response decoded as it arrives
+JSON_STREAM_CHUNK_SIZE = 64 * 1024
+
+# Retries of idempotent calls that cannot connect or that the host answers with
+# one of RETRY_STATUSES while it starts: calls in total and backoff bounds
+RETRY_ATTEMPTS = int(os.environ.get("RETRY_ATTEMPTS", "3"))
+RETRY_BASE_DELAY = float(os.environ.get("RETRY_BASE_DELAY", "0.5"))  # seconds
+RETRY_MAX_DELAY = float(os.environ.get("RETRY_MAX_DELAY", "8"))  # seconds
+RETRY_STATUSES = (502, 503, 504)
+
+# Circuit breaker: consecutive failed calls that open it, and how long it fails
+# calls fast before letting a trial call through
+BREAKER_THRESHOLD = int(os.environ.get("BREAKER_THRESHOLD", "5"))
+BREAKER_RESET_TIMEOUT = float(os.environ.get("BREAKER_RESET_TIMEOUT", "30"))  # seconds
+
+# Admission control across every session: calls each endpoint may have in flight
+# at once (others get ADMISSION_DEFAULT_LIMIT), and calls that may wait for a slot
+# per endpoint before more are turned away. Heavy endpoints get small limits so a
+# busy hour of batch uploads cannot time everyone out at once.
+ENDPOINT_CONCURRENCY = {
+    "/candidate/parse_resume": 4,
+    "/candidate/match_with_job": 8,
+    "/recruiter/find_matches": 4,
+    "/recruiter/find_matches/jobs": 4,
+}
+ADMISSION_DEFAULT_LIMIT = int(os.environ.get("ADMISSION_DEFAULT_LIMIT", "16"))
+ADMISSION_MAX_QUEUE = int(os.environ.get("ADMISSION_MAX_QUEUE", "50"))
+
+# Warm-up ping sent while the login page is shown, so a sleeping backend starts
+# before the user logs in: path, (connect, read) timeout long enough for a cold
+# start, how long a successful ping counts, and when the login page says it is waiting
+WARMUP_PATH = os.environ.get("WARMUP_PATH", "/")
+WARMUP_TIMEOUT = (10, 120)
+WARMUP_INTERVAL = 60  # seconds
+WARMUP_NOTICE_AFTER = 3  # seconds
+
+# Endpoints whose responses identical concurrent calls share across users, and
+# the role a user must hold to share another user's call. The backend confirms
+# the role (through /me) before a response is shared. Other coalesced calls are
+# only shared between the same user's sessions.
+SHARED_RESPONSE_ROLES = {
+    "/recruiter/find_matches": "recruiter",
+}
+# Statuses that answer the caller's credentials rather than the request
+PER_USER_STATUSES = (401, 403)
+
+# Ceiling on the resume bytes a single upload request may carry
+MAX_UPLOAD_BYTES_PER_REQUEST = 50 * 2**20
+
+# Identities looked up through /me, for tokens whose claims do not carry them
+IDENTITY_CACHE_TTL = 300  # seconds
+IDENTITY_CACHE_MAXSIZE = 1000
+
+# Refresh the access token this long before it expires (or halfway through its
+# life, for short-lived tokens). Longer than the slowest request (find_matches
+# can read for 600s), so no call starts with a token that expires while it runs.
+TOKEN_REFRESH_MARGIN = 900  # seconds
+
+# Per-user candidate profile cache
+PROFILE_CACHE_TTL = 300  # seconds
+PROFILE_CACHE_MAXSIZE = 1000
+
+# Match results shared across sessions with identical inputs
+MATCH_CACHE_TTL = 900  # seconds
+MATCH_CACHE_MAXSIZE = 128
+
+# Background match jobs: poll backoff bounds and how long jobs are remembered
+JOB_POLL_INITIAL_INTERVAL = 1  # seconds
+JOB_POLL_MAX_INTERVAL = 15
+JOB_REGISTRY_TTL = 3600
+JOB_REGISTRY_MAXSIZE = 1000
+
+# Candidates' applied but unsaved profile edits, restored when they come back
+PROFILE_DRAFT_TTL = 7 * 24 * 3600  # seconds
+PROFILE_DRAFT_MAXSIZE = 1000
+
+# Parsed resumes, keyed by user and PDF content hash: on disk, or in the state
+# store when one is configured. Kept across logins, so re-uploading the same
+# PDF fills the form at once until the entry expires.
+PARSE_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "parsed_resumes.sqlite3")
+PARSE_CACHE_MAXSIZE = 500
+PARSE_CACHE_TTL = 30 * 24 * 3600  # seconds
+
+# Where the caches shared by every session live: memory:// in this process,
+# sqlite:///path or redis://host:port/db to share them between replicas (see
+# state_store.py). With a shared store, logins are kept there too until their
+# token expires, under a random id in a browser cookie, so any replica can
+# carry on a session.
+STATE_STORE_URL = os.environ.get("STATE_STORE_URL", "memory://")
+SESSION_COOKIE = "recruitment_sid"
+SESSION_MAXSIZE = 10000  # logins kept at once; past it the soonest to expire are dropped
+
+# Loads started at login for the page the user lands on: worker threads shared
+# by every session, and how long the page waits for one before loading itself
+PREFETCH_MAX_WORKERS = 8
+PREFETCH_WAIT = 30  # seconds
+
+# Page name -> (script, title). Pages are run by app.py through st.navigation.
+PAGES = {
+    "login": ("views/login.py", "Login"),
+    "candidate_dashboard": ("views/candidate_dashboard.py", "Dashboard"),
+    "candidate_profile": ("views/candidate_profile.py", "My Profile"),
+    "recruiter_find_matches": ("views/recruiter_find_matches.py", "Find Matches"),
+}
+# Pages each role may open, its landing page first. Logging in or out changes
+# the pages on offer, so it sets current_page and reruns instead of navigating.
+ROLE_PAGES = {
+    None: ("login",),
+    "candidate": ("candidate_dashboard", "candidate_profile"),
+    "recruiter": ("recruiter_find_matches",),
+}
+
+
+def init_session_state():
+    """Session state defaults, set on a session's first run"""
+    if "user_token" not in st.session_state:
+        st.session_state.user_token = None
+    if "token_expires_at" not in st.session_state:
+        st.session_state.token_expires_at = None
+    if "token_refresh_at" not in st.session_state:
+        st.session_state.token_refresh_at = None
+    if "user_id" not in st.session_state:
+        st.session_state.user_id = None
+    if "role" not in st.session_state:
+        st.session_state.role = None
+    if "current_page" not in st.session_state:
+        st.session_state.current_page = "login"
+    if "profile_loaded_key" not in st.session_state:
+        st.session_state.profile_loaded_key = None
+    if "profile_snapshot" not in st.session_state:
+        st.session_state.profile_snapshot = None
+    if "match_job" not in st.session_state:
+        st.session_state.match_job = None
+    if "match_results" not in st.session_state:
+        st.session_state.match_results = None
+    if "match_table" not in st.session_state:
+        st.session_state.match_table = None
+    if "job_batch_results" not in st.session_state:
+        st.session_state.job_batch_results = None
+    if "prefetches" not in st.session_state:
+        st.session_state.prefetches = {}
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = None
+    if "session_cookie" not in st.session_state:
+        # (value, max-age) for the browser's session cookie, until it is sent
+        st.session_state.session_cookie = None
+    if "session_cookie_read" not in st.session_state:
+        st.session_state.session_cookie_read = False
+
+    if st.session_state.role == "candidate":
+        if "profile" not in st.session_state:
+            st.session_state.profile = Profile()
+
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """Shared keep-alive session to the backend, created once per server process"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=0
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # The session is shared by every user, so never let cookies leak between them
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+@st.cache_resource
+def get_metrics() -> Metrics:
+    """Process-wide metrics, also served on METRICS_PORT when it is set"""
+    metrics = Metrics(sample_rate=METRICS_SAMPLE_RATE)
+    if METRICS_PORT:
+        start_metrics_server(metrics, int(METRICS_PORT))
+    return metrics
+
+
+def get_timeout(endpoint: str) -> tuple:
+    """Get the (connect, read) timeout for an endpoint"""
+    return ENDPOINT_TIMEOUTS.get(endpoint, DEFAULT_TIMEOUT)
+
+
+def _dispatch(session: requests.Session, url: str, method: str, headers: Dict, data: Any,
+              params: Optional[Dict], form_data: bool, files: Optional[Any], timeout: tuple,
+              stream: bool = False) -> requests.Response:
+    """Issue a request on the shared session with the right body encoding.
+
+    data is the form fields for form_data, otherwise the JSON body already encoded.
+    """
+    if method == "GET":
+        return session.get(url, headers=headers, params=params, timeout=timeout, stream=stream)
+    elif method == "POST":
+        if isinstance(files, MultipartStream):
+            # Streamed multipart upload, read straight from the upload buffers
+            headers["Content-Type"] = files.content_type
+            return session.post(url, headers=headers, params=params, data=files, timeout=timeout, stream=stream)
+        elif files is not None:
+            # Multipart upload, requests sets the Content-Type boundary itself
+            return session.post(url, headers=headers, params=params, files=files, timeout=timeout, stream=stream)
+        elif form_data:
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+            return session.post(url, headers=headers, data=data, timeout=timeout, stream=stream)
+        else:
+            headers["Content-Type"] = "application/json"
+            return session.post(url, headers=headers, data=data, params=params, timeout=timeout, stream=stream)
+    elif method == "PUT":
+        headers["Content-Type"] = "application/json"
+        return session.put(url, headers=headers, data=data, timeout=timeout, stream=stream)
+    elif method == "PATCH":
+        headers["Content-Type"] = "application/json"
+        return session.patch(url, headers=headers, data=data, timeout=timeout, stream=stream)
+    raise ValueError(f"Unsupported method: {method}")
+
+
+@st.cache_resource
+def get_circuit_breaker() -> CircuitBreaker:
+    """Circuit breaker for the backend, shared by every session"""
+    return CircuitBreaker(threshold=BREAKER_THRESHOLD, reset_timeout=BREAKER_RESET_TIMEOUT)
+
+
+@st.cache_resource
+def get_admission() -> AdmissionController:
+    """Admission controller for backend calls, shared by every session"""
+    return AdmissionController(ENDPOINT_CONCURRENCY, ADMISSION_DEFAULT_LIMIT, ADMISSION_MAX_QUEUE)
+
+
+def send_request(endpoint: str, method: str = "GET", data: Optional[Dict] = None,
+                 token: Optional[str] = None, params: Optional[Dict] = None, form_data: bool = False,
+                 files: Optional[Any] = None, timeout: Optional[tuple] = None,
+                 idempotent: Optional[bool] = None,
+                 on_queued: Optional[Callable[[int], None]] = None, stream: bool = False,
+                 use_breaker: bool = True) -> requests.Response:
+    """Send a request to the backend, raising on connection errors.
+
+    Does not touch any Streamlit elements, so it is safe to call from worker threads.
+    timeout overrides the endpoint's (connect, read) timeout. GET and PUT are
+    retried with backoff when the backend cannot be reached or is starting;
+    idempotent overrides that for calls that are (or are not) safe to repeat.
+    Uploads are never retried, their bodies are streamed once. Raises
+    CircuitOpen without calling the backend while the circuit breaker is open;
+    without use_breaker the call neither checks nor counts towards it.
+
+    Each attempt waits for an admission slot, taking turns with other users'
+    calls by token; on_queued gets the call's place in the queue while it
+    waits (see AdmissionController.acquire). Raises Overloaded if the
+    endpoint's queue is full.
+
+    JSON bodies to GZIP_REQUEST_ENDPOINTS are gzipped when the backend takes
+    them. With stream, the body is left to be read as it arrives, e.g. by
+    stream_json_array; the slot is released once the headers are in.
+    """
+    headers = {}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    body = data
+    if data is not None and not form_data and files is None and method in ("POST", "PUT", "PATCH"):
+        body = dumps(data)
+        if (endpoint in GZIP_REQUEST_ENDPOINTS and len(body) >= GZIP_MIN_BYTES
+                and get_backend_features()["gzip_requests"]):
+            body = gzip.compress(body, GZIP_LEVEL)
+            headers["Content-Encoding"] = "gzip"
+    
+    url = f"{API_BASE_URL}{endpoint}"
+    session = get_http_session()
+    timeout = timeout or get_timeout(endpoint)
+    metrics = get_metrics()
+    breaker = get_circuit_breaker() if use_breaker else None
+    admission = get_admission()
+    route = endpoint_label(endpoint)
+    if idempotent is None:
+        idempotent = method in ("GET", "PUT")
+    retry_policy = RetryPolicy(RETRY_ATTEMPTS, RETRY_BASE_DELAY, RETRY_MAX_DELAY)
+    attempts = retry_policy.attempts if idempotent and not files else 1
+    
+    for attempt in range(1, attempts + 1):
+        try:
+            waited = admission.acquire(route, token, on_queued)
+        except Overloaded:
+            metrics.record_shed(method, endpoint)
+            raise
+        if waited:
+            metrics.record_queued(method, endpoint, waited)
+        try:
+            if breaker:
+                breaker.before_call()
+            start = time.perf_counter()
+            try:
+                response = _dispatch(session, url, method, headers, body, params, form_data, files, timeout, stream)
+            except requests.ConnectionError:
+                metrics.record_request(method, endpoint, "error", time.perf_counter() - start)
+                if breaker:
+                    breaker.record_failure()
+                if attempt == attempts:
+                    raise
+                delay = retry_policy.delay(attempt)
+            except Exception:
+                # e.g. a read timeout: the backend is up, just slow
+                metrics.record_request(method, endpoint, "error", time.perf_counter() - start)
+                if breaker:
+                    breaker.release()
+                raise
+            else:
+                sent = response.request.body
+                metrics.record_request(
+                    method, endpoint, response.status_code, time.perf_counter() - start,
+                    request_bytes=len(sent) if sent is not None else 0,
+                    # A streamed body is not read yet, count what the backend says it sends
+                    response_bytes=int(response.headers.get("Content-Length") or 0) if stream else len(response.content)
+                )
+                if response.status_code not in RETRY_STATUSES:
+                    if breaker:
+                        breaker.record_success()
+                    break
+                if breaker:
+                    breaker.record_failure()
+                if attempt == attempts:
+                    break
+                delay = retry_policy.delay(attempt, retry_after_seconds(response.headers.get("Retry-After")))
+        finally:
+            # The slot is not held through the backoff, others may use it meanwhile
+            admission.release(route)
+        metrics.record_retry(method, endpoint)
+        time.sleep(delay)
+    
+    if response.status_code == 415 and headers.get("Content-Encoding") == "gzip":
+        # The backend does not take gzipped bodies after all: send this call, and later ones, plain
+        get_backend_features()["gzip_requests"] = False
+        return send_request(endpoint, method, data, token=token, params=params, form_data=form_data, files=files,
+                            timeout=timeout, idempotent=idempotent, on_queued=on_queued, stream=stream,
+                            use_breaker=use_breaker)
+    return response
+
+
+def api_request(endpoint: str, method: str = "GET", data: Optional[Dict] = None, 
+                token: Optional[str] = None, params: Optional[Dict] = None, form_data: bool = False,
+                files: Optional[Any] = None, idempotent: Optional[bool] = None) -> Dict:
+    """Make an API request to the backend, showing the user's place in the queue if it has to wait"""
+    try:
+        return send_request(endpoint, method, data, token=token, params=params,
+                            form_data=form_data, files=files, idempotent=idempotent,
+                            on_queued=queue_notice())
+    except Exception as e:
+        st.error(f"API request failed: {str(e)}")
+        return {"error": str(e)}
+
+
+def queue_notice() -> Callable[[int], None]:
+    """on_queued callback for calls made on the script thread.
+
+    Shows the call's place in the admission queue while it waits, drawn only
+    once it has to wait, and clears it once the call is admitted.
+    """
+    placeholder = None
+    
+    def show(position: int):
+        nonlocal placeholder
+        if placeholder is None:
+            placeholder = st.empty()
+        if position:
+            placeholder.info(f"The service is busy, you are number {position} in the queue...")
+        else:
+            placeholder.empty()
+    
+    return show
+
+
+@st.cache_resource
+def get_single_flight() -> SingleFlight:
+    """In-flight backend calls shared by every session"""
+    return SingleFlight()
+
+
+def coalesce_key(endpoint: str, method: str = "GET", params: Optional[Dict] = None, body_digest: str = "") -> tuple:
+    """Key under which identical concurrent calls share one backend call.
+
+    Calls in one key have the same method, endpoint, params and body. The
+    key is also scoped to who may share the response: the session's role for
+    endpoints in SHARED_RESPONSE_ROLES, as long as the session holds that
+    role with an unexpired token, and the user otherwise. The session's view
+    of its role is only a hint, send_coalesced has the backend confirm it.
+    Reads session state, so call it from the script thread.
+    """
+    role = SHARED_RESPONSE_ROLES.get(endpoint)
+    expires_at = st.session_state.token_expires_at
+    signed_in = st.session_state.user_token and (expires_at is None or time.time() < expires_at)
+    if role is not None and st.session_state.role == role and signed_in:
+        scope = ("role", role)
+    else:
+        scope = ("user", st.session_state.user_id)
+    normalized_params = tuple(sorted((name, str(value)) for name, value in (params or {}).items()))
+    return method, endpoint, scope, normalized_params, body_digest
+
+
+def send_coalesced(key: tuple, endpoint: str, method: str = "GET", token: Optional[str] = None,
+                   params: Optional[Dict] = None, files: Optional[Any] = None,
+                   on_queued: Optional[Callable[[int], None]] = None,
+                   on_items: Optional[Callable[[List], None]] = None) -> requests.Response:
+    """send_request, sharing the response of an identical call (same coalesce_key) already in flight.
+
+    Safe to call from worker threads. Connection errors reach every caller
+    sharing the call. A shared 401 or 403 answered someone else's
+    credentials, and a response shared by role is only taken once the
+    backend confirms the caller holds it; otherwise the caller makes its own
+    call. Only the call actually made waits for admission, and reports to
+    on_queued, and only it streams a 200 response's JSON array to on_items as
+    it arrives (see stream_json_array); callers sharing it get the whole
+    response, read in full before it is shared.
+    """
+    def call():
+        response = send_request(endpoint, method, token=token, params=params, files=files,
+                                on_queued=on_queued, stream=on_items is not None)
+        if on_items is not None and response.status_code == 200:
+            stream_json_array(response, on_items)
+        else:
+            # Read a streamed body here, so sharing callers never read one socket at once
+            response.content
+        return response
+
+    response, shared = get_single_flight().do(key, call)
+    if shared:
+        get_metrics().record_coalesced(method, endpoint)
+        scope = key[2]
+        if response.status_code in PER_USER_STATUSES or (scope[0] == "role" and not holds_role(token, scope[1])):
+            return call()
+    return response
+
+
+def holds_role(token: Optional[str], role: str) -> bool:
+    """Whether the backend, asked now, confirms the token is valid and holds the role"""
+    try:
+        response = send_request(f"/me", "GET", token=token)
+    except Exception:
+        return False
+    return response.status_code == 200 and response_json(response).get("role") == role
+
+
+def stream_json_array(response: requests.Response, on_items: Callable[[List], None]):
+    """Decode a streamed response's JSON array as it arrives, passing on_items each batch of new items.
+
+    The body is kept, so the response reads as usual afterwards, e.g. for
+    callers that shared it through send_coalesced.
+    """
+    decoder = ArrayDecoder()
+    chunks = []
+    for chunk in response.iter_content(JSON_STREAM_CHUNK_SIZE):
+        chunks.append(chunk)
+        items = decoder.feed(chunk)
+        if items:
+            on_items(items)
+    items = decoder.feed(b"", final=True)
+    if items:
+        on_items(items)
+    response._content = b"".join(chunks)
+
+
+def ping_backend() -> bool:
+    """Whether the backend answered the warm-up ping; any answer short of a 5xx means it is up.
+
+    The ping goes around the circuit breaker: a host still starting is
+    expected to fail it, which should not fail users' calls.
+    """
+    return send_request(WARMUP_PATH, "GET", timeout=WARMUP_TIMEOUT, use_breaker=False).status_code < 500
+
+
+@st.cache_resource
+def get_state_store() -> Optional[StateStore]:
+    """The store named by STATE_STORE_URL, None when shared state is kept in this process"""
+    return open_store(STATE_STORE_URL)
+
+
+def shared_cache(namespace: str, maxsize: int, ttl: float) -> Union[TTLCache, StoreCache]:
+    """A cache for every session: a TTLCache, or the namespace of the state store when one is configured"""
+    store = get_state_store()
+    if store is None:
+        return TTLCache(maxsize=maxsize, ttl=ttl)
+    return StoreCache(store, namespace, ttl, maxsize)
+
+
+@st.cache_resource
+def get_backend_warmup() -> Warmup:
+    """Warm-up pinger shared by every session, so concurrent logins send one ping"""
+    return Warmup(ping_backend, interval=WARMUP_INTERVAL)
+
+
+@st.cache_resource
+def get_profile_cache() -> Union[TTLCache, StoreCache]:
+    """Profile cache shared by every session, keyed per user"""
+    return shared_cache("profile", PROFILE_CACHE_MAXSIZE, PROFILE_CACHE_TTL)
+
+
+def profile_cache_key() -> Optional[str]:
+    """Key of the current user's entry in the profile cache"""
+    return st.session_state.user_id or st.session_state.user_token
+
+
+def invalidate_profile_cache():
+    """Drop the current user's cached profile so the next load hits the backend"""
+    get_profile_cache().invalidate(profile_cache_key())
+    # Candidate match scores depend on the profile, so they are stale too
+    user_id = st.session_state.user_id
+    get_match_cache().invalidate_where(lambda key: key[0] == "match_with_job" and key[1] == user_id)
+
+
+@st.cache_resource
+def get_match_cache() -> Union[TTLCache, StoreCache]:
+    """Match result cache shared by every session"""
+    return shared_cache("match", MATCH_CACHE_MAXSIZE, MATCH_CACHE_TTL)
+
+
+@st.cache_resource
+def get_profile_drafts() -> Union[TTLCache, StoreCache]:
+    """Each candidate's applied but unsaved profile edits, in the backend's profile format"""
+    return shared_cache("profile_draft", PROFILE_DRAFT_MAXSIZE, PROFILE_DRAFT_TTL)
+
+
+@st.cache_resource
+def get_parse_cache() -> Union[DiskCache, StoreCache]:
+    """Parsed resume cache shared by every session, in the state store when one is configured"""
+    store = get_state_store()
+    if store is None:
+        return DiskCache(PARSE_CACHE_PATH, maxsize=PARSE_CACHE_MAXSIZE, ttl=PARSE_CACHE_TTL)
+    return StoreCache(store, "parsed_resume", PARSE_CACHE_TTL, PARSE_CACHE_MAXSIZE)
+
+
+def parse_cache_key(pdf_digest: str) -> str:
+    """Key of the current user's parse of a PDF in the parse cache"""
+    # The s3_link in a parse result belongs to the uploader, so entries are per user
+    return f"{profile_cache_key()}:{pdf_digest}"
+
+
+def profile_cache_entry(response: requests.Response) -> Optional[tuple]:
+    """The (new_profile, data) profile cache entry for a get_profile response, None if it failed"""
+    if response.status_code in (200, 201):
+        return False, response_json(response)
+    if response.status_code < 500:
+        # No profile saved yet
+        return True, {}
+    return None
+
+
+@st.cache_resource
+def get_job_registry() -> Union[TTLCache, StoreCache]:
+    """Each user's latest background match job, so a reconnecting session can pick it up"""
+    return shared_cache("match_job", JOB_REGISTRY_MAXSIZE, JOB_REGISTRY_TTL)
+
+
+def poll_match_job(job: Dict, token: str):
+    """Check on a background job once, backing off exponentially while it runs.
+
+    Updates job in place; callers store it back in the job registry, which
+    may hold a copy. Does not touch session state, so it is safe to call
+    from worker threads.
+    """
+    try:
+        response = send_request(f"/recruiter/find_matches/jobs/{job['job_id']}", "GET", token=token)
+    except Exception:
+        response = None
+    
+    if response is not None and response.status_code == 200:
+        status = response_json(response)
+        job["status"] = status["status"]
+        if job["status"] == "done":
+            job["matches"] = status["result"]
+            get_match_cache().set(job["cache_key"], job["matches"])
+            return
+        if job["status"] == "failed":
+            job["error"] = status.get("detail", "Matching failed")
+            return
+    elif response is not None and response.status_code == 404:
+        job["status"] = "failed"
+        job["error"] = "The background search is no longer available, please run it again"
+        return
+    
+    # Still running, or the status check itself failed
+    job["poll_interval"] = min(job["poll_interval"] * 2, JOB_POLL_MAX_INTERVAL)
+    job["next_poll_at"] = time.time() + job["poll_interval"]
+
+
+@st.cache_resource
+def get_backend_features() -> Dict:
+    """Optional backend capabilities, discovered at runtime and shared by every session"""
+    return {"profile_patch": True, "find_matches_jobs": True, "token_refresh": True, "gzip_requests": GZIP_REQUESTS}
+
+
+@st.cache_resource
+def get_identity_cache() -> Union[TTLCache, StoreCache]:
+    """user_id and role per access token, shared by every session"""
+    return shared_cache("identity", IDENTITY_CACHE_MAXSIZE, IDENTITY_CACHE_TTL)
+
+
+def resolve_identity(token: str) -> Optional[Dict]:
+    """The user_id and role behind a token.
+
+    Read from the token's claims when it carries them, otherwise from the
+    identity cache, and only as a last resort from /me. Returns None if /me
+    fails, after reporting the error.
+    """
+    identity = identity_from_claims(decode_claims(token))
+    if identity is not None:
+        return identity
+    
+    cache = get_identity_cache()
+    # Key by digest so bearer tokens are not kept in shared memory
+    cache_key = content_digest(token.encode())
+    identity = cache.get(cache_key)
+    if identity is None:
+        user_info = api_request(f"/me", "GET", token=token)
+        if isinstance(user_info, dict):
+            return None
+        if user_info.status_code not in (200, 201):
+            st.error(f"Error: {user_info.json()["detail"]}")
+            return None
+        user_details = user_info.json()
+        identity = {"user_id": user_details["user_id"], "role": user_details["role"]}
+        cache.set(cache_key, identity)
+    return identity
+
+
+@st.cache_resource
+def get_prefetch_executor() -> ThreadPoolExecutor:
+    """Worker threads for background loads, shared by every session"""
+    return ThreadPoolExecutor(max_workers=PREFETCH_MAX_WORKERS, thread_name_prefix="prefetch")
+
+
+def start_prefetch(name: str, load: Callable[[threading.Event], None]):
+    """Run load on a prefetch worker, for the page that calls wait_for_prefetch(name).
+
+    load fills the shared caches the page reads, and gets an event that is
+    set once its result is no longer wanted; it must not store anything after.
+    """
+    cancelled = threading.Event()
+    future = get_prefetch_executor().submit(load, cancelled)
+    st.session_state.prefetches[name] = (future, cancelled)
+
+
+def wait_for_prefetch(name: str):
+    """Wait for the named prefetch, if one is running, so its data is cached before the page reads it"""
+    prefetch = st.session_state.prefetches.pop(name, None)
+    if prefetch is None:
+        return
+    try:
+        prefetch[0].result(timeout=PREFETCH_WAIT)
+    except Exception:
+        # The page loads the data itself
+        prefetch[1].set()
+
+
+def cancel_prefetches():
+    """Drop the session's prefetches: queued ones never run and running ones store nothing"""
+    for future, cancelled in st.session_state.prefetches.values():
+        cancelled.set()
+        future.cancel()
+    st.session_state.prefetches = {}
+
+
+def prefetch_landing_page():
+    """Start loading what the user's first page shows: a candidate's profile, a recruiter's last search"""
+    token = st.session_state.user_token
+    user_id = st.session_state.user_id
+    if st.session_state.role == "candidate":
+        profile_cache = get_profile_cache()
+        cache_key = profile_cache_key()
+        
+        def load_profile(cancelled: threading.Event):
+            if profile_cache.get(cache_key) is not None:
+                return
+            entry = profile_cache_entry(send_request(f"/candidate/get_profile", "GET", token=token))
+            if entry is not None and not cancelled.is_set():
+                profile_cache.set(cache_key, entry)
+        
+        start_prefetch("profile", load_profile)
+    else:
+        job = get_job_registry().get(user_id)
+        if job is None or job["status"] in ("done", "failed"):
+            # No search, or its results are already at hand
+            return
+        
+        def load_last_search(cancelled: threading.Event):
+            if cancelled.is_set():
+                return
+            poll_match_job(job, token)
+            if not cancelled.is_set():
+                get_job_registry().set(user_id, job)
+        
+        start_prefetch("last_search", load_last_search)
+
+
+def set_access_token(token_response: Dict):
+    """Store a token from /token, /signup or /refresh and schedule its refresh"""
+    token = token_response["access_token"]
+    expires_at = token_expiry(decode_claims(token), token_response.get("expires_in"))
+    st.session_state.user_token = token
+    st.session_state.token_expires_at = expires_at
+    st.session_state.token_refresh_at = None
+    if expires_at is not None:
+        st.session_state.token_refresh_at = expires_at - min(TOKEN_REFRESH_MARGIN, (expires_at - time.time()) / 2)
+
+
+def start_session(token_response: Dict) -> bool:
+    """Log in with a /token or /signup response; False if the user could not be identified"""
+    identity = resolve_identity(token_response["access_token"])
+    if identity is None:
+        return False
+    set_access_token(token_response)
+    st.session_state.user_id = identity["user_id"]
+    st.session_state.role = identity["role"]
+    save_session()
+    # Overlap the landing page's loads with the rerun into it
+    cancel_prefetches()
+    prefetch_landing_page()
+    return True
+
+
+# Session state a login consists of, as kept in the state store
+SESSION_FIELDS = ("user_token", "token_expires_at", "token_refresh_at", "user_id", "role")
+
+
+@st.cache_resource
+def get_session_cache() -> Optional[StoreCache]:
+    """Logins by session id, None without a shared state store.
+
+    Each login is stored for its token's remaining lifetime, never the cache's default TTL.
+    """
+    store = get_state_store()
+    return StoreCache(store, "session", ttl=0, maxsize=SESSION_MAXSIZE) if store is not None else None
+
+
+def save_session():
+    """Keep the login in the state store until its token expires, for the session cookie to resume it"""
+    cache = get_session_cache()
+    if cache is None:
+        return
+    expires_at = st.session_state.token_expires_at
+    if expires_at is None or expires_at <= time.time():
+        # Without a known expiry a kept login could outlive its token
+        return
+    if st.session_state.session_id is None:
+        st.session_state.session_id = secrets.token_urlsafe(32)
+    ttl = expires_at - time.time()
+    cache.set(st.session_state.session_id, {name: st.session_state[name] for name in SESSION_FIELDS}, ttl)
+    st.session_state.session_cookie = (st.session_state.session_id, ttl)
+
+
+def resume_session():
+    """Resume the login named by the browser's session cookie, once per new session.
+
+    A session lives on the replica it connected to, so after a reconnect to
+    another replica (or a page reload) only the cookie tells who the user
+    is. Each resume moves the login to a new id, so an old cookie value
+    stops working once it has been used.
+    """
+    cache = get_session_cache()
+    if cache is None or st.session_state.session_cookie_read:
+        return
+    st.session_state.session_cookie_read = True
+    sid = dict(st.context.cookies).get(SESSION_COOKIE)
+    if st.session_state.user_token or not sid:
+        return
+    record = cache.get(sid)
+    if record is None:
+        # Logged out, expired or already resumed elsewhere
+        st.session_state.session_cookie = ("", 0)
+        return
+    cache.invalidate(sid)
+    for name in SESSION_FIELDS:
+        st.session_state[name] = record[name]
+    save_session()
+    reset_profile()
+    cancel_prefetches()
+    prefetch_landing_page()
+
+
+def write_session_cookie():
+    """Send the browser the session cookie set by save_session or cleared by logout"""
+    cookie = st.session_state.session_cookie
+    if cookie is None:
+        return
+    st.session_state.session_cookie = None
+    value, max_age = cookie
+    attributes = f"Max-Age={int(max_age)}; Path=/; SameSite=Strict"
+    # HTML frames are same-origin, so the script can set the app's cookie.
+    # The value is always a server-generated id, never user input.
+    st.iframe(
+        "<script>const page = window.parent;"
+        f"page.document.cookie = {dumps(f'{SESSION_COOKIE}={value}; {attributes}').decode()}"
+        " + (page.location.protocol === 'https:' ? '; Secure' : '');</script>",
+        height="content"
+    )
+
+
+def ensure_fresh_token():
+    """Refresh the access token shortly before it expires, so long sessions do not fail midway.
+
+    Without a refresh endpoint the token is used until it expires, and then
+    the user is sent back to the login page.
+    """
+    refresh_at = st.session_state.token_refresh_at
+    if not st.session_state.user_token or refresh_at is None or time.time() < refresh_at:
+        return
+    
+    features = get_backend_features()
+    rejected = False
+    if features["token_refresh"]:
+        try:
+            response = send_request(f"/refresh", "POST", token=st.session_state.user_token)
+        except Exception:
+            # Try again on the next rerun
+            response = None
+        if response is not None and response.status_code in (200, 201):
+            set_access_token(response.json())
+            save_session()
+            return
+        if response is not None and response.status_code in (404, 405, 501):
+            features["token_refresh"] = False
+        rejected = response is not None and response.status_code == 401
+    
+    if rejected or time.time() >= st.session_state.token_expires_at:
+        logout()
+        st.warning("Your session has expired, please log in again.")
+
+
+def reset_profile():
+    """Start the session over with an empty profile"""
+    st.session_state.profile = Profile()
+    st.session_state.profile_loaded_key = None
+    st.session_state.profile_snapshot = None
+
+
+def logout():
+    """Log out the current user"""
+    cancel_prefetches()
+    invalidate_profile_cache()
+    get_profile_drafts().invalidate(st.session_state.user_id)
+    if st.session_state.session_id is not None:
+        get_session_cache().invalidate(st.session_state.session_id)
+        st.session_state.session_id = None
+        st.session_state.session_cookie = ("", 0)
+    reset_profile()
+    st.session_state.match_job = None
+    st.session_state.match_results = None
+    st.session_state.match_table = None
+    st.session_state.job_batch_results = None
+    st.session_state.user_token = None
+    st.session_state.token_expires_at = None
+    st.session_state.token_refresh_at = None
+    st.session_state.user_id = None
+    st.session_state.role = None
+    st.session_state.current_page = "login"
+
+def navigate_to(page: str):
+    """Navigate to another of the user's pages, ending this run"""
+    st.session_state.current_page = page
+    st.switch_page(PAGES[page][0])
+
+
+# Navigation
+def show_navigation():
+    """Display navigation bar"""
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+    
+    with col1:
+        st.write(f"Logged in as: {st.session_state.role.capitalize()}")
+    
+    if st.session_state.role == "candidate":
+        with col2:
+            if st.button("Dashboard", use_container_width=True):
+                navigate_to("candidate_dashboard")
+        with col3:
+            if st.button("My Profile", use_container_width=True):
+                navigate_to("candidate_profile")
+    else:  # recruiter
+        # with col2:
+        #     if st.button("Dashboard", use_container_width=True):
+        #         navigate_to("recruiter_dashboard")
+        with col3:
+            if st.button("Find Matches", use_container_width=True):
+                navigate_to("recruiter_find_matches")
+    
+    with col4:
+        if st.button("Logout", use_container_width=True):
+            logout()
+            st.rerun()
+    
+    st.divider()
+
+
+def split_list(text: str, separator: str) -> List[str]:
+    return [item.strip() for item in text.split(separator) if item.strip()]
+
+
+def find_matches_error(response) -> str:
+    """Extract a readable error message from a failed find_matches response"""
+    try:
+        error_response = response.json()
+        return error_response.get("detail", f"Error: Status code {response.status_code}")
+    except Exception:
+        return f"Error: Status code {response.status_code}"
+
+
+def show_metrics_panel():
+    """Admin debug panel with backend call and page render metrics"""
+    metrics = get_metrics()
+    snapshot = metrics.to_dict()
+    with st.sidebar.expander("Performance metrics", expanded=False):
+        st.caption(f"Latency and sizes sampled at {snapshot['sample_rate']:.0%}")
+        if snapshot["requests"]:
+            st.dataframe([{
+                "endpoint": f"{row['method']} {row['endpoint']}",
+                "calls": row["calls"],
+                "retries": row["retries"],
+                "coalesced": row["coalesced"],
+                "queued": row["queued"],
+                "shed": row["shed"],
+                "errors": sum(count for status, count in row["statuses"].items() if not status.startswith("2")),
+                "p50 (s)": row["latency_seconds"]["p50"],
+                "p95 (s)": row["latency_seconds"]["p95"],
+            } for row in snapshot["requests"]], hide_index=True)
+        admission = get_admission().snapshot()
+        if admission:
+            st.caption("Admission: calls running and waiting now, per endpoint")
+            st.dataframe([dict(endpoint=endpoint, **counts) for endpoint, counts in admission.items()], hide_index=True)
+        if snapshot["pages"]:
+            st.dataframe([{
+                "page": row["page"],
+                "renders": row["renders"],
+                "p50 (s)": row["duration_seconds"]["p50"],
+                "p95 (s)": row["duration_seconds"]["p95"],
+            } for row in snapshot["pages"]], hide_index=True)
+        st.download_button("Download JSON", metrics.to_json(), file_name="metrics.json", mime="application/json")
+        st.download_button("Download Prometheus", metrics.to_prometheus(), file_name="metrics.prom", mime="text/plain")
@@ -0,0 +1,55 @@
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, Tuple
+
+
+class LeaderStopped(Exception):
+    """The call a waiter was sharing was stopped before it finished"""
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time; callers arriving meanwhile share its outcome.
+
+    The first caller for a key (the leader) makes the call on its own thread.
+    Others wait on a future and get the leader's result, or its exception
+    raised again. Nothing is kept once the call finishes, so later callers
+    call again; caching results is up to the caller.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def do(self, key: Hashable, call: Callable) -> Tuple[object, bool]:
+        """Return call()'s result, or an identical in-flight call's, and whether it was shared"""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+
+        if not leader:
+            try:
+                return future.result(), True
+            except LeaderStopped:
+                # The leader's script run was stopped, not its call failed
+                return self.do(key, call)
+
+        try:
+            result = call()
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        except BaseException:
+            future.set_exception(LeaderStopped())
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._calls[key]
@@ -0,0 +1,353 @@
+"""Stores for the state every session shares: caches, logins and profile drafts.
+
+By default that state lives in the server process, in TTLCaches. To run
+several replicas behind a load balancer without sticky sessions, point them
+at a store they share: SQLite for processes on one host, or anything that
+speaks the Redis protocol for any number of hosts.
+
+    memory://                   this process only (the default)
+    sqlite:///path/to/state.db  processes on one host
+    redis://[:password@]host:port/db
+
+StoreCache gives a namespace of a store the same interface as TTLCache.
+Keys and values are kept as JSON, so values must be JSON-serializable and
+come back with tuples as lists. Entries expire after their TTL in every
+store, and each namespace keeps at most maxsize entries: past it, those
+expiring soonest are dropped, i.e. the oldest rather than the least recently
+used. While a store cannot be reached, its caches miss and drop writes
+rather than fail the page.
+"""
+import logging
+import os
+import queue
+import socket
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Hashable, List, Optional
+from urllib.parse import unquote, urlsplit
+
+from json_codec import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+
+def namespace_of(key: str) -> str:
+    """The namespace of a store key, the part before its first colon"""
+    return key.split(":", 1)[0]
+
+
+def _prefix_end(prefix: str) -> str:
+    """The least string greater than every string starting with prefix"""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class StateStore:
+    """Bytes under "namespace:name" keys, each expiring after its own TTL"""
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: float, maxsize: Optional[int] = None):
+        """Store a value, then keep at most maxsize entries in its namespace, dropping those expiring soonest"""
+        raise NotImplementedError
+
+    def delete(self, keys: List[str]):
+        raise NotImplementedError
+
+    def scan(self, prefix: str) -> List[str]:
+        """Every live key starting with prefix"""
+        raise NotImplementedError
+
+
+class SQLiteStore(StateStore):
+    """Store in a SQLite file, shared by every process on the host that opens it"""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        with self._conn:
+            # Readers in other processes do not block writers, nor the other way round
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS state ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS state_expires_at ON state (expires_at)")
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM state WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def set(self, key: str, value: bytes, ttl: float, maxsize: Optional[int] = None):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO state (key, value, expires_at) VALUES (?, ?, ?)", (key, value, now + ttl)
+            )
+            self._conn.execute("DELETE FROM state WHERE expires_at <= ?", (now,))
+            if maxsize is not None:
+                prefix = namespace_of(key) + ":"
+                self._conn.execute(
+                    "DELETE FROM state WHERE key IN (SELECT key FROM state WHERE key >= ? AND key < ?"
+                    " ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                    (prefix, _prefix_end(prefix), maxsize)
+                )
+
+    def delete(self, keys: List[str]):
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM state WHERE key = ?", [(key,) for key in keys])
+
+    def scan(self, prefix: str) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key FROM state WHERE key >= ? AND key < ? AND expires_at > ?",
+                (prefix, _prefix_end(prefix), time.time())
+            ).fetchall()
+        return [row[0] for row in rows]
+
+
+class RedisError(Exception):
+    """An error reply from the Redis server"""
+
+
+class _NoReply(ConnectionError):
+    """The connection failed before any of the reply arrived"""
+
+
+class RedisStore(StateStore):
+    """Store on a Redis server, or anything speaking its protocol (RESP).
+
+    Needs no client library: the handful of commands used are spoken over
+    a small pool of sockets, one batch of commands at a time per socket.
+    Each namespace keeps a sorted set of its keys by expiry time, to find
+    the entries to drop past maxsize without scanning the keyspace.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 6379, db: int = 0,
+                 password: Optional[str] = None, timeout: float = 5.0):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        conn = (sock, sock.makefile("rb"))
+        if self.password:
+            self._call(conn, "AUTH", self.password)
+        if self.db:
+            self._call(conn, "SELECT", self.db)
+        return conn
+
+    def _call(self, conn, *args):
+        return self._call_many(conn, [args])[0]
+
+    def _call_many(self, conn, commands: List[tuple]) -> list:
+        """Send the commands in one write and read their replies, raising the first error reply after all are read"""
+        sock, reader = conn
+        parts = []
+        for args in commands:
+            parts.append(b"*%d\r\n" % len(args))
+            for arg in args:
+                data = arg if isinstance(arg, bytes) else str(arg).encode()
+                parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        try:
+            sock.sendall(b"".join(parts))
+            line = reader.readline()
+        except socket.timeout:
+            raise
+        except OSError as e:
+            raise _NoReply(str(e)) from e
+        if not line:
+            raise _NoReply("The Redis server closed the connection")
+        replies, error = [], None
+        for index in range(len(commands)):
+            try:
+                replies.append(self._read_reply(reader, line if index == 0 else None))
+            except RedisError as e:
+                replies.append(None)
+                error = error or e
+        if error is not None:
+            raise error
+        return replies
+
+    def _read_reply(self, reader, line: Optional[bytes] = None):
+        line = line or reader.readline()
+        if not line:
+            raise ConnectionError("The Redis server closed the connection")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            raise RedisError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            return None if length < 0 else reader.read(length + 2)[:-2]
+        if kind == b"*":
+            length = int(rest)
+            return None if length < 0 else [self._read_reply(reader) for _ in range(length)]
+        raise ConnectionError(f"Unexpected reply from the Redis server: {line!r}")
+
+    def command(self, *args):
+        """Send one command and return its reply, raising RedisError for error replies"""
+        return self.pipeline([args])[0]
+
+    def pipeline(self, commands: List[tuple]) -> list:
+        """Send several commands in one round trip and return their replies"""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            return self._pipeline_on(self._connect(), commands)
+        try:
+            return self._pipeline_on(conn, commands)
+        except _NoReply:
+            # An idle connection the server has since closed, e.g. after a
+            # restart or its idle timeout. Nothing was read, so try once more.
+            return self._pipeline_on(self._connect(), commands)
+
+    def _pipeline_on(self, conn, commands: List[tuple]) -> list:
+        try:
+            replies = self._call_many(conn, commands)
+        except RedisError:
+            self._idle.put(conn)
+            raise
+        except BaseException:
+            # The connection may be midway through a reply, do not reuse it
+            conn[0].close()
+            raise
+        self._idle.put(conn)
+        return replies
+
+    @staticmethod
+    def _index(namespace: str) -> str:
+        # Outside every namespace's "namespace:" prefix, so scans never see it
+        return f"{namespace}#expiry"
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.command("GET", key)
+
+    def set(self, key: str, value: bytes, ttl: float, maxsize: Optional[int] = None):
+        ttl_ms = max(1, int(ttl * 1000))
+        if maxsize is None:
+            self.command("SET", key, value, "PX", ttl_ms)
+            return
+        index = self._index(namespace_of(key))
+        now_ms = int(time.time() * 1000)
+        _, _, _, count = self.pipeline([
+            ("SET", key, value, "PX", ttl_ms),
+            ("ZADD", index, now_ms + ttl_ms, key),
+            ("ZREMRANGEBYSCORE", index, "-inf", now_ms),
+            ("ZCARD", index),
+        ])
+        if count > maxsize:
+            dropped = self.command("ZRANGE", index, 0, count - maxsize - 1)
+            if dropped:
+                self.pipeline([("DEL", *dropped), ("ZREM", index, *dropped)])
+
+    def delete(self, keys: List[str]):
+        if not keys:
+            return
+        commands = [("DEL", *keys)]
+        for namespace in {namespace_of(key) for key in keys}:
+            commands.append(("ZREM", self._index(namespace), *[key for key in keys if namespace_of(key) == namespace]))
+        self.pipeline(commands)
+
+    def scan(self, prefix: str) -> List[str]:
+        pattern = "".join("\\" + char if char in "*?[]\\" else char for char in prefix) + "*"
+        keys, cursor = [], "0"
+        while True:
+            cursor, batch = self.command("SCAN", cursor, "MATCH", pattern, "COUNT", 1000)
+            keys.extend(key.decode() for key in batch)
+            cursor = cursor.decode()
+            if cursor == "0":
+                return keys
+
+
+def open_store(url: str) -> Optional[StateStore]:
+    """The store a STATE_STORE_URL names, None for memory://"""
+    parts = urlsplit(url)
+    if parts.scheme == "memory":
+        return None
+    if parts.scheme == "sqlite":
+        return SQLiteStore(unquote(parts.path))
+    if parts.scheme == "redis":
+        return RedisStore(
+            parts.hostname or "127.0.0.1", parts.port or 6379, int(parts.path.strip("/") or 0),
+            password=unquote(parts.password) if parts.password else None
+        )
+    raise ValueError(f"Unsupported state store: {url}")
+
+
+# What a store raises when it cannot be reached or used
+STORE_ERRORS = (OSError, RedisError, sqlite3.Error)
+
+
+class StoreCache:
+    """A namespace of a StateStore with TTLCache's interface, holding at most maxsize entries if given.
+
+    While the store cannot be reached, reads miss and writes are dropped,
+    logging once when that starts and once when it is back.
+    """
+
+    def __init__(self, store: StateStore, namespace: str, ttl: float, maxsize: Optional[int] = None):
+        self.store = store
+        self.prefix = f"{namespace}:"
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._unavailable = False
+
+    def _key(self, key: Hashable) -> str:
+        return self.prefix + dumps(key).decode()
+
+    def _attempt(self, operation: Callable[[], Any], default: Any = None) -> Any:
+        try:
+            result = operation()
+        except STORE_ERRORS as e:
+            if not self._unavailable:
+                self._unavailable = True
+                logger.warning("State store unavailable, %s* cache bypassed: %s", self.prefix, e)
+            return default
+        if self._unavailable:
+            self._unavailable = False
+            logger.info("State store available again for %s*", self.prefix)
+        return result
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Get a cached value, or the default if it is missing or expired"""
+        value = self._attempt(lambda: self.store.get(self._key(key)))
+        return loads(value) if value is not None else default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Cache a value for ttl seconds, the cache's own TTL by default"""
+        data = dumps(value)
+        self._attempt(lambda: self.store.set(self._key(key), data, ttl or self.ttl, self.maxsize))
+
+    def invalidate(self, key: Hashable):
+        """Drop a single entry"""
+        self._attempt(lambda: self.store.delete([self._key(key)]))
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]):
+        """Drop every entry whose key matches the predicate; keys are decoded from JSON"""
+        self._attempt(lambda: self.store.delete([
+            key for key in self.store.scan(self.prefix) if predicate(loads(key[len(self.prefix):]))
+        ]))
+
+    def clear(self):
+        """Drop every entry"""
+        self._attempt(lambda: self.store.delete(self.store.scan(self.prefix)))
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._attempt(lambda: self.store.get(self._key(key))) is not None
+
+    def __len__(self) -> int:
+        return len(self._attempt(lambda: self.store.scan(self.prefix), []))
@@ -0,0 +1,71 @@
+import pytest
+
+from job_links import canonical_job_link
+
+# (link, expected canonical link)
+CORPUS = (
+    # Generic sites
+    ("https://Jobs.Example.com/posting/42/", "https://jobs.example.com/posting/42"),
+    ("jobs.example.com/posting/42", "https://jobs.example.com/posting/42"),
+    ("https://jobs.example.com:443/posting/42#apply", "https://jobs.example.com/posting/42"),
+    ("https://jobs.example.com:8443/posting/42", "https://jobs.example.com:8443/posting/42"),
+    ("https://jobs.example.com/posting?b=2&a=1&utm_source=x&UTM_Medium=y",
+     "https://jobs.example.com/posting?a=1&b=2"),
+    ("https://jobs.example.com/posting?source=board&ref=7&src=x", "https://jobs.example.com/posting?ref=7&source=board&src=x"),
+    ("https://careers.acme.com/open-roles?gh_jid=4012345&utm_campaign=abc", "https://careers.acme.com/open-roles?gh_jid=4012345"),
+    ("https://careers.acme.com/#/jobs/123?ref=home", "https://careers.acme.com#/jobs/123?ref=home"),
+    ("http://jobs.example.com//posting//42", "http://jobs.example.com/posting/42"),
+    # IPv6 hosts keep their brackets
+    ("http://[::1]:8080/jobs/1", "http://[::1]:8080/jobs/1"),
+    ("https://[2001:DB8::1]/jobs/1?utm_source=x", "https://[2001:db8::1]/jobs/1"),
+    # Links that cannot be parsed are only stripped
+    (" https://x.com:abc/a ", "https://x.com:abc/a"),
+    ("https://jobs.example.com:99999/a", "https://jobs.example.com:99999/a"),
+    ("http://[bad", "http://[bad"),
+    ("job at acme.com:8080x", "job at acme.com:8080x"),
+    # LinkedIn
+    ("https://www.linkedin.com/jobs/view/3712345678/", "https://www.linkedin.com/jobs/view/3712345678"),
+    ("https://www.linkedin.com/jobs/view/3712345678/?refId=abc&trackingId=def&trk=public_jobs",
+     "https://www.linkedin.com/jobs/view/3712345678"),
+    ("https://m.linkedin.com/jobs/view/3712345678", "https://www.linkedin.com/jobs/view/3712345678"),
+    ("https://uk.linkedin.com/jobs/view/senior-engineer-at-acme-3712345678?originalSubdomain=uk",
+     "https://www.linkedin.com/jobs/view/3712345678"),
+    ("https://www.linkedin.com/comm/jobs/view/3712345678", "https://www.linkedin.com/jobs/view/3712345678"),
+    ("https://www.linkedin.com/jobs/search/?currentJobId=3712345678&keywords=python",
+     "https://www.linkedin.com/jobs/view/3712345678"),
+    ("https://www.linkedin.com/jobs/collections/recommended/?currentJobId=3712345678",
+     "https://www.linkedin.com/jobs/view/3712345678"),
+    ("http://linkedin.com/jobs/view/3712345678#top", "https://www.linkedin.com/jobs/view/3712345678"),
+    # Greenhouse
+    ("https://boards.greenhouse.io/acme/jobs/4012345", "https://job-boards.greenhouse.io/acme/jobs/4012345"),
+    ("https://job-boards.greenhouse.io/acme/jobs/4012345?gh_src=abc",
+     "https://job-boards.greenhouse.io/acme/jobs/4012345"),
+    ("https://boards.greenhouse.io/embed/job_app?for=acme&token=4012345",
+     "https://job-boards.greenhouse.io/acme/jobs/4012345"),
+    ("https://job-boards.eu.greenhouse.io/acme/jobs/4012345#app",
+     "https://job-boards.eu.greenhouse.io/acme/jobs/4012345"),
+    # Lever
+    ("https://jobs.lever.co/acme/7F1C2D3E-4A5B-4C6D-8E9F-0A1B2C3D4E5F",
+     "https://jobs.lever.co/acme/7f1c2d3e-4a5b-4c6d-8e9f-0a1b2c3d4e5f"),
+    ("https://jobs.lever.co/acme/7f1c2d3e-4a5b-4c6d-8e9f-0a1b2c3d4e5f/apply?lever-source=LinkedIn",
+     "https://jobs.lever.co/acme/7f1c2d3e-4a5b-4c6d-8e9f-0a1b2c3d4e5f"),
+    ("https://jobs.eu.lever.co/acme/7f1c2d3e-4a5b-4c6d-8e9f-0a1b2c3d4e5f/",
+     "https://jobs.eu.lever.co/acme/7f1c2d3e-4a5b-4c6d-8e9f-0a1b2c3d4e5f"),
+    # Workday
+    ("https://acme.wd5.myworkdayjobs.com/en-US/External/job/Boston-MA/Software-Engineer_R12345",
+     "https://acme.wd5.myworkdayjobs.com/External/details/Software-Engineer_R12345"),
+    ("https://acme.wd5.myworkdayjobs.com/External/job/US-Remote/Software-Engineer_R12345/apply/applyManually?source=LinkedIn",
+     "https://acme.wd5.myworkdayjobs.com/External/details/Software-Engineer_R12345"),
+    ("https://ACME.wd5.myworkdayjobs.com/External/details/Software-Engineer_R12345/",
+     "https://acme.wd5.myworkdayjobs.com/External/details/Software-Engineer_R12345"),
+)
+
+
+@pytest.mark.parametrize("link, expected", CORPUS)
+def test_canonical_job_link(link, expected):
+    assert canonical_job_link(link) == expected
+
+
+@pytest.mark.parametrize("expected", sorted({expected for _, expected in CORPUS}))
+def test_canonical_links_are_fixed_points(expected):
+    assert canonical_job_link(expected) == expected
@@ -0,0 +1,85 @@
+import pandas as pd
+
+from match_table import TABLE_COLUMNS, filter_matches, flatten_matches, rank_matches
+
+
+def match(score, link, **profile):
+    return {"match_score": score, "resume_link": link, "user_profile": profile}
+
+
+def test_flatten_takes_first_role_and_institution():
+    table = flatten_matches([match(
+        90, "a", name="A", total_years_of_experience=4, skills=["Python"],
+        experience=[{"role": "Engineer"}, {"role": "Intern"}], education=[{"institution": "MIT"}]
+    )])
+    assert table.loc[0, "latest_role"] == "Engineer"
+    assert table.loc[0, "institution"] == "MIT"
+    assert table.loc[0, "years_of_experience"] == 4
+
+
+def test_flatten_every_profile_without_education_or_experience():
+    # Fresh profiles often have neither section yet, or empty ones
+    table = flatten_matches([
+        match(80, "a", name="A", education=[], experience=[]),
+        match(70, "b", name="B"),
+    ])
+    assert len(table) == 2
+    assert table["latest_role"].isna().all()
+    assert table["institution"].isna().all()
+
+
+def test_flatten_mixed_sections():
+    table = flatten_matches([
+        match(80, "a", name="A"),
+        match(70, "b", name="B", experience=[], education=None),
+        match(60, "c", name="C", experience=[{"role": "Engineer"}], education=[{"institution": "MIT"}]),
+    ])
+    assert table["latest_role"][:2].isna().all()
+    assert table["institution"][:2].isna().all()
+    assert table.loc[2, "latest_role"] == "Engineer"
+    assert table.loc[2, "institution"] == "MIT"
+
+
+def test_flatten_non_numeric_scores_and_years():
+    table = flatten_matches([
+        match("85", "a", total_years_of_experience="n/a"),
+        match("error", "b", total_years_of_experience="3"),
+        match(None, "c"),
+    ])
+    assert table["match_score"].tolist() == [85, 0, 0]
+    assert pd.isna(table.loc[0, "years_of_experience"])
+    assert table.loc[1, "years_of_experience"] == 3
+
+
+def test_flatten_empty_input():
+    table = flatten_matches([])
+    assert table.empty
+    assert list(table.columns) == TABLE_COLUMNS
+    assert filter_matches(table, min_score=50, min_years=1, required_skills=["python"]).empty
+    assert rank_matches(table, ["python"], {"match_score": 1}).empty
+
+
+def test_filter_by_score_years_and_skills():
+    table = flatten_matches([
+        match(90, "a", total_years_of_experience=5, skills=["Python", "SQL"]),
+        match(90, "b", total_years_of_experience=1, skills=["python", "sql"]),
+        match(40, "c", total_years_of_experience=9, skills=["Python", "SQL"]),
+        match(90, "d", total_years_of_experience=7, skills=["Python"]),
+        match(90, "e", skills=None),
+    ])
+    kept = filter_matches(table, min_score=50, min_years=2, required_skills=[" SQL", "python"])
+    assert kept["resume_link"].tolist() == ["a"]
+
+
+def test_rank_weights_and_stable_ties():
+    table = flatten_matches([
+        match(50, "a", total_years_of_experience=10, skills=["Go"]),
+        match(90, "b", total_years_of_experience=1, skills=["Python"]),
+        match(90, "c", total_years_of_experience=1, skills=["Python"]),
+    ])
+    by_score = rank_matches(table, [], {"match_score": 1})
+    assert by_score["resume_link"].tolist() == ["b", "c", "a"]
+    by_years = rank_matches(table, ["python"], {"years_of_experience": 1})
+    assert by_years["resume_link"].tolist()[0] == "a"
+    by_skills = rank_matches(table, ["python"], {"skill_overlap": 1})
+    assert by_skills["skill_overlap"].tolist() == [1, 1, 0]
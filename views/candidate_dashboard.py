@@ -0,0 +1,202 @@
+"""Candidate dashboard: score the candidate's profile against job postings"""
+import streamlit as st
+import requests
+import csv
+import io
+import math
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed
+from typing import Dict, List, Any, Optional
+
+from job_links import canonical_job_link
+from shared import api_request, find_matches_error, get_match_cache, send_request, show_navigation
+
+# Batch scoring: most links per batch, concurrent requests, and seconds the
+# whole batch may take. Each link gets the endpoint's own timeout.
+MATCH_BATCH_MAX_LINKS = 100
+MATCH_BATCH_MAX_WORKERS = 4
+MATCH_BATCH_DEADLINE = 900
+
+
+def match_criteria_value(match_criteria: str) -> int:
+    return {"Strict": 3, "Moderate": 2, "Flexible": 1}[match_criteria]
+
+
+def match_with_job_cache_key(job_link: str, criteria: int) -> tuple:
+    """Cache key for a candidate's score against a canonical job link"""
+    # Scores depend on the candidate's own profile, so entries are per user
+    return ("match_with_job", st.session_state.user_id, job_link, criteria)
+
+
+def read_job_links(text: str, csv_file: Any = None) -> tuple:
+    """Job links pasted one per line and/or listed in a CSV file.
+
+    The CSV's "job_link", "link" or "url" column is used, or else its first
+    column, which must be UTF-8 (UnicodeDecodeError otherwise). Returns the links in order, without later spellings of a link
+    whose canonical form came before, and how many repeats were dropped.
+    """
+    links = [line.strip() for line in text.splitlines() if line.strip()]
+    if csv_file is not None:
+        rows = list(csv.reader(io.StringIO(csv_file.getvalue().decode("utf-8-sig"))))
+        header = [cell.strip().lower() for cell in rows[0]] if rows else []
+        column = next((header.index(name) for name in ("job_link", "link", "url") if name in header), None)
+        if column is not None:
+            rows = rows[1:]
+        links.extend(row[column or 0].strip() for row in rows if len(row) > (column or 0) and row[column or 0].strip())
+
+    first_spelling = {}
+    for link in links:
+        first_spelling.setdefault(canonical_job_link(link), link)
+    unique = list(first_spelling.values())
+    return unique, len(links) - len(unique)
+
+
+def numeric_score(match_score: Any) -> Optional[float]:
+    """A match score as a number, None if it is missing or not a number"""
+    try:
+        score = float(match_score)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(score) else score
+
+
+def show_job_batch_results(rows: List[Dict], placeholder=None):
+    """Batch scores as a table, best match first and scores that are not numbers last"""
+    def best_first(row: Dict) -> tuple:
+        score = numeric_score(row["match_score"])
+        return score is None, -(score or 0)
+
+    ranked = sorted(rows, key=best_first)
+    (placeholder or st).dataframe(
+        ranked,
+        column_config={"job_link": st.column_config.LinkColumn("job link")},
+        hide_index=True
+    )
+
+
+def score_job_links(job_links: List[str], criteria: int) -> List[Dict]:
+    """Score many job links concurrently, streaming rows into a table as scores arrive.
+
+    Links whose score is cached are not sent again. Each request has the
+    endpoint's timeout, so one slow posting cannot hold up the rest, and
+    links still unscored after MATCH_BATCH_DEADLINE are reported as timed out.
+    """
+    match_cache = get_match_cache()
+    token = st.session_state.user_token
+    rows = []
+    pending = []
+    for job_link in job_links:
+        cache_key = match_with_job_cache_key(canonical_job_link(job_link), criteria)
+        match_score = match_cache.get(cache_key)
+        row = {
+            "job_link": job_link,
+            "match_score": match_score,
+            "status": "cached" if match_score is not None else "pending"
+        }
+        rows.append(row)
+        if match_score is None:
+            pending.append((row, cache_key))
+    
+    if not pending:
+        return rows
+    progress = st.progress(0.0, text=f"Scoring {len(pending)} jobs...")
+    table = st.empty()
+    show_job_batch_results(rows, table)
+    
+    executor = ThreadPoolExecutor(max_workers=min(MATCH_BATCH_MAX_WORKERS, len(pending)))
+    futures = {
+        executor.submit(
+            send_request, f"/candidate/match_with_job", "GET", token=token,
+            params={"job_link": row["job_link"], "match_criteria": criteria}
+        ): (row, cache_key)
+        for row, cache_key in pending
+    }
+    try:
+        for done, future in enumerate(as_completed(futures, timeout=MATCH_BATCH_DEADLINE), start=1):
+            row, cache_key = futures[future]
+            try:
+                response = future.result()
+                if response.status_code == 200:
+                    row["match_score"] = response.json()
+                    row["status"] = "scored"
+                    match_cache.set(cache_key, row["match_score"])
+                else:
+                    row["status"] = find_matches_error(response)
+            except requests.Timeout:
+                row["status"] = "timed out"
+            except Exception as e:
+                row["status"] = f"Connection error: {str(e)}"
+            
+            progress.progress(done / len(pending), text=f"Scored {done} of {len(pending)} jobs")
+            show_job_batch_results(rows, table)
+    except TimeoutError:
+        # Past the batch deadline: report what is left instead of waiting for it
+        for future, (row, _) in futures.items():
+            if not future.done():
+                row["status"] = "timed out"
+    finally:
+        # Links not yet sent are dropped; ones in flight finish in the background
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    progress.empty()
+    table.empty()
+    return rows
+
+
+def candidate_dashboard():
+    """Dashboard for candidates"""
+    show_navigation()
+    st.title("Candidate Dashboard")
+    match_criteria = st.selectbox("Select Match Criteria", ["Strict", "Moderate", "Flexible"])
+    criteria = match_criteria_value(match_criteria)
+    batch_mode = st.checkbox("Score several jobs at once")
+    
+    if batch_mode:
+        links_text = st.text_area("Job links (one per line)")
+        links_file = st.file_uploader("Or upload a CSV of job links", type="csv")
+        if st.button("Score Jobs"):
+            try:
+                job_links, repeats = read_job_links(links_text, links_file)
+            except UnicodeDecodeError:
+                # e.g. a CSV saved by Excel in the Windows code page
+                st.error("Please upload the CSV encoded as UTF-8 (\"CSV UTF-8\" when saving from Excel).")
+            else:
+                if not job_links:
+                    st.error("Please enter or upload at least one job link.")
+                elif len(job_links) > MATCH_BATCH_MAX_LINKS:
+                    st.error(f"Please score at most {MATCH_BATCH_MAX_LINKS} job links at a time.")
+                else:
+                    if repeats:
+                        st.info(f"Skipped {repeats} repeated links")
+                    st.session_state.job_batch_results = score_job_links(job_links, criteria)
+        
+        if st.session_state.job_batch_results:
+            show_job_batch_results(st.session_state.job_batch_results)
+        return
+    
+    # add a input box to enter the job link, and a button to find the match score
+    job_link = st.text_input("Enter Job Link")
+
+    if st.button("Find Match Score"):
+        if job_link:
+            job_link = job_link.strip()
+            match_cache = get_match_cache()
+            cache_key = match_with_job_cache_key(canonical_job_link(job_link), criteria)
+            match_score = match_cache.get(cache_key)
+            if match_score is None:
+                # Call the API to get the match score
+                query_params = {
+                    "job_link": job_link,
+                    "match_criteria": criteria
+                }
+                response = api_request(f"/candidate/match_with_job", "GET",params=query_params, token=st.session_state.user_token)
+                if isinstance(response, dict):
+                    return
+                if response.status_code != 200:
+                    st.error(f"Error: {response.json()["detail"]}")
+                    return
+                match_score = response.json()
+                match_cache.set(cache_key, match_score)
+            st.success(f"Your match score for this job is: {match_score}")
+
+
+candidate_dashboard()
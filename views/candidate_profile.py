@@ -0,0 +1,441 @@
+"""Candidate profile editor, with resume autofill"""
+import streamlit as st
+from typing import Dict
+
+from caching import content_digest
+from multipart_stream import MultipartStream, UploadTooLarge
+from profile_delta import apply_delta, diff_profile, is_empty, profile_digest
+from profile_model import Education, Experience, Profile, Project
+from shared import (
+    MAX_UPLOAD_BYTES_PER_REQUEST, api_request, get_backend_features, get_parse_cache, get_profile_cache,
+    get_profile_drafts, invalidate_profile_cache, parse_cache_key, profile_cache_entry, profile_cache_key,
+    show_navigation, split_list, wait_for_prefetch
+)
+
+
+def save_profile_draft():
+    """Keep the profile's applied edits until they are saved, for the candidate's next session"""
+    get_profile_drafts().set(st.session_state.user_id, st.session_state.profile.to_api())
+
+
+def get_candidate_profile():
+    """Load the candidate's profile, from the per-user cache when possible.
+
+    The profile is copied into session state once per login, so later reruns
+    keep the user's unsaved edits.
+    """
+    # Usually fetched in the background since login
+    wait_for_prefetch("profile")
+    cache = get_profile_cache()
+    cache_key = profile_cache_key()
+    cached = cache.get(cache_key)
+    if cached is None:
+        # send request to get profile for this user, and display it in the form
+        response = api_request(f"/candidate/get_profile", method="GET", token=st.session_state.user_token)
+        if isinstance(response, dict):
+            # Connection error, already reported by api_request
+            return True, {}
+        cached = profile_cache_entry(response)
+        if cached is None:
+            return True, {}
+        cache.set(cache_key, cached)
+    
+    new_profile, data = cached
+    if st.session_state.profile_loaded_key != cache_key:
+        st.session_state.profile_loaded_key = cache_key
+        # Last-synced copy that profile saves are diffed against. Cache entries
+        # are never mutated, so the snapshot can share this one.
+        st.session_state.profile_snapshot = None if new_profile else data
+        draft = get_profile_drafts().get(st.session_state.user_id)
+        if draft is not None:
+            st.session_state.profile = Profile.from_api(draft)
+            st.session_state.profile_draft_restored = True
+        elif not new_profile:
+            st.session_state.profile = Profile.from_api(data)
+        reset_profile_forms()
+    if new_profile:
+        return True, {}
+    return False, data["parsed_resume"]
+    
+def update_profile(request_data: Dict) -> tuple:
+    """Update an existing profile, sending only the changes since the last sync.
+
+    Falls back to a full PUT when there is no snapshot to diff against, the
+    backend does not support PATCH, or the stored profile changed underneath us.
+    Returns the response (None when there is nothing to save) and the profile
+    the backend now holds.
+    """
+    snapshot = st.session_state.profile_snapshot
+    features = get_backend_features()
+    
+    if snapshot is not None and features["profile_patch"]:
+        delta = diff_profile(snapshot["parsed_resume"], request_data["parsed_resume"])
+        patch_data = {
+            "base_digest": profile_digest(snapshot["parsed_resume"]),
+            "parsed_resume": delta
+        }
+        if request_data["s3_link"] != snapshot.get("s3_link"):
+            patch_data["s3_link"] = request_data["s3_link"]
+        if is_empty(delta) and "s3_link" not in patch_data:
+            return None, snapshot
+        
+        response = api_request(
+            f"/candidate/update_profile",
+            method="PATCH",
+            data=patch_data,
+            token=st.session_state.user_token
+        )
+        if isinstance(response, dict):
+            return response, snapshot
+        if response.status_code in (200, 201):
+            synced = {
+                "parsed_resume": apply_delta(snapshot["parsed_resume"], delta),
+                "s3_link": request_data["s3_link"]
+            }
+            return response, synced
+        if response.status_code in (404, 405, 501):
+            features["profile_patch"] = False
+        elif response.status_code != 409:
+            return response, snapshot
+    
+    # Send update request
+    response = api_request(
+        f"/candidate/update_profile",
+        method="PUT",
+        data=request_data,
+        token=st.session_state.user_token
+    )
+    return response, request_data
+
+
+def autofill_profile(uploaded_file, force_reparse: bool = False):
+    """Fill the profile form from a resume, reusing the parse of an identical PDF"""
+    with uploaded_file.getbuffer() as pdf_bytes:
+        cache_key = parse_cache_key(content_digest(pdf_bytes))
+    parse_cache = get_parse_cache()
+    
+    data = None if force_reparse else parse_cache.get(cache_key)
+    if data is not None:
+        st.success("Resume loaded from cache - this file was already parsed.")
+    else:
+        # Send the uploaded file to the API
+        try:
+            files = MultipartStream(
+                [("file", uploaded_file.name, uploaded_file, "application/pdf")],
+                max_bytes=MAX_UPLOAD_BYTES_PER_REQUEST
+            )
+        except UploadTooLarge as e:
+            st.error(str(e))
+            return
+        response = api_request(
+            f"/candidate/parse_resume",
+            method="POST",
+            token=st.session_state.user_token,
+            files=files
+        )
+        if isinstance(response, dict):
+            return
+        if response.status_code not in (200, 201):
+            st.error(f"Error: {response.json()["detail"]}")
+            return
+        invalidate_profile_cache()
+        st.success("Resume parsed successfully!")
+        data = response.json()
+        parse_cache.set(cache_key, data)
+    
+    st.session_state.profile.update_from_api(data)
+    reset_profile_forms()
+    save_profile_draft()
+
+
+PROFILE_SECTIONS = ("basic_info", "skills", "education", "experience", "projects")
+
+
+def form_key(section: str, name: str) -> str:
+    """Widget key in a profile editor section, renewed each time the section's forms are reset"""
+    return f"{name}_r{st.session_state.get(f'{section}_form_rev', 0)}"
+
+
+def reset_profile_forms(*sections: str):
+    """Rebuild the editor widgets of the given sections (all by default) from session state.
+
+    Keyed widgets keep showing the values they were last given, so this is
+    needed whenever profile data is replaced or entries change position.
+    """
+    for section in sections or PROFILE_SECTIONS:
+        rev_key = f"{section}_form_rev"
+        st.session_state[rev_key] = st.session_state.get(rev_key, 0) + 1
+
+
+def add_profile_entry(section: str, entry_type: type):
+    getattr(st.session_state.profile, section).append(entry_type())
+    save_profile_draft()
+
+
+def remove_profile_entry(section: str, index: int):
+    getattr(st.session_state.profile, section).pop(index)
+    # Later entries move up one position
+    reset_profile_forms(section)
+    save_profile_draft()
+
+
+# Each editor section is a fragment and each entry a form, so typing reruns
+# nothing and applying, adding or removing an entry reruns only its own section.
+# Adding and removing happen in button callbacks, before the section is drawn.
+@st.fragment
+def basic_info_section():
+    profile = st.session_state.profile
+    with st.form(form_key("basic_info", "basic_info_form"), border=False):
+        col1, col2 = st.columns(2)
+        with col1:
+            name = st.text_input("Full Name", value=profile.name, help="Enter your full name")
+        with col2:
+            linkedin = st.text_input("LinkedIn URL", value=profile.linkedin, help="Enter your LinkedIn profile URL")
+            github = st.text_input("GitHub URL", value=profile.github, help="Enter your GitHub profile URL")
+
+        total_years_of_experience = st.text_input("Total Years of Experience", value=profile.total_years_of_experience, help="Enter your total years of experience")
+
+        if st.form_submit_button("Apply"):
+            profile.name = name
+            profile.linkedin = linkedin
+            profile.github = github
+            profile.total_years_of_experience = total_years_of_experience
+            save_profile_draft()
+
+
+@st.fragment
+def skills_section():
+    st.subheader("Your Skills")
+    with st.form(form_key("skills", "skills_form"), border=False):
+        new_skills = st.text_area(
+            "Skills (comma separated)",
+            value=", ".join(st.session_state.profile.skills),
+            help="Enter skills separated by commas"
+        )
+        if st.form_submit_button("Apply"):
+            st.session_state.profile.skills = split_list(new_skills, ",")
+            save_profile_draft()
+
+
+@st.fragment
+def education_section():
+    st.subheader("Education History")
+
+    entries = st.session_state.profile.education
+    for edu_idx, edu in enumerate(entries):
+
+        with st.form(form_key("education", f"education_form_{edu_idx}")):
+            st.markdown(f"**Education #{edu_idx + 1}**")
+            col1, col2 = st.columns(2)
+            with col1:
+                institution = st.text_input(f"Institution", value=edu.institution, key=form_key("education", f"inst_{edu_idx}"))
+                degree = st.text_input(f"Degree", value=edu.degree, key=form_key("education", f"deg_{edu_idx}"))
+            with col2:
+                gpa = st.text_input(f"GPA", value=edu.GPA, key=form_key("education", f"gpa_{edu_idx}"))
+                graduation = st.text_input(f"Graduation Date", value=edu.graduation, key=form_key("education", f"grad_{edu_idx}"))
+
+            coursework = st.text_area(
+                f"Relevant Coursework",
+                value=", ".join(edu.coursework),
+                key=form_key("education", f"course_{edu_idx}"),
+                help="Enter coursework separated by commas"
+            )
+
+            col1, col2 = st.columns(2)
+            with col1:
+                applied = st.form_submit_button("Apply")
+            with col2:
+                st.form_submit_button(
+                    "Remove ❌", on_click=remove_profile_entry,
+                    args=("education", edu_idx)
+                )
+
+        if applied:
+            entries[edu_idx] = Education(
+                institution=institution,
+                degree=degree,
+                GPA=gpa,
+                graduation=graduation,
+                coursework=split_list(coursework, ",")
+            )
+            save_profile_draft()
+
+    st.button("Add Another Education", on_click=add_profile_entry, args=("education", Education))
+
+
+@st.fragment
+def experience_section():
+    st.subheader("Work Experience")
+
+    entries = st.session_state.profile.experience
+    for exp_idx, exp in enumerate(entries):
+
+        with st.form(form_key("experience", f"experience_form_{exp_idx}")):
+            st.markdown(f"**Experience #{exp_idx + 1}**")
+            col1, col2 = st.columns(2)
+            with col1:
+                role = st.text_input(f"Role/Position", value=exp.role, key=form_key("experience", f"role_{exp_idx}"))
+                organization = st.text_input(f"Organization", value=exp.organization, key=form_key("experience", f"org_{exp_idx}"))
+            with col2:
+                start_date = st.text_input(f"Start Date", value=exp.start, key=form_key("experience", f"start_{exp_idx}"))
+                end_date = st.text_input(f"End Date", value=exp.end, key=form_key("experience", f"end_{exp_idx}"))
+
+            details = st.text_area(
+                f"Details (one per line)",
+                value="\n".join(exp.details),
+                key=form_key("experience", f"details_{exp_idx}"),
+                help="Enter each bullet point on a new line"
+            )
+            skills_related = st.text_input(
+                f"Skills Used",
+                value=", ".join(exp.skills_related),
+                key=form_key("experience", f"skills_exp_{exp_idx}"),
+                help="Enter skills separated by commas"
+            )
+
+            col1, col2 = st.columns(2)
+            with col1:
+                applied = st.form_submit_button("Apply")
+            with col2:
+                st.form_submit_button(
+                    "Remove ❌", on_click=remove_profile_entry,
+                    args=("experience", exp_idx)
+                )
+
+        if applied:
+            entries[exp_idx] = Experience(
+                role=role,
+                organization=organization,
+                start=start_date,
+                end=end_date,
+                details=split_list(details, "\n"),
+                skills_related=split_list(skills_related, ",")
+            )
+            save_profile_draft()
+
+    st.button("Add Another Experience", on_click=add_profile_entry, args=("experience", Experience))
+
+
+@st.fragment
+def projects_section():
+    st.subheader("Projects and Accomplishments")
+
+    entries = st.session_state.profile.projects
+    for proj_idx, proj in enumerate(entries):
+
+        with st.form(form_key("projects", f"project_form_{proj_idx}")):
+            st.markdown(f"**Project #{proj_idx + 1}**")
+            name = st.text_input(f"Project Name", value=proj.name, key=form_key("projects", f"proj_{proj_idx}"))
+            skills_related = st.text_input(
+                f"Skills Used",
+                value=", ".join(proj.skills_related),
+                key=form_key("projects", f"skills_proj_{proj_idx}"),
+                help="Enter skills separated by commas"
+            )
+            details = st.text_area(
+                f"Details (one per line)",
+                value="\n".join(proj.details),
+                key=form_key("projects", f"proj_details_{proj_idx}"),
+                help="Enter each bullet point on a new line"
+            )
+
+            col1, col2 = st.columns(2)
+            with col1:
+                applied = st.form_submit_button("Apply")
+            with col2:
+                st.form_submit_button(
+                    "Remove ❌", on_click=remove_profile_entry,
+                    args=("projects", proj_idx)
+                )
+
+        if applied:
+            entries[proj_idx] = Project(
+                name=name,
+                skills_related=split_list(skills_related, ","),
+                details=split_list(details, "\n")
+            )
+            save_profile_draft()
+
+    st.button("Add Another Project", on_click=add_profile_entry, args=("projects", Project))
+
+
+def candidate_profile():
+    """Profile page for candidates"""
+    show_navigation()
+    st.title("Candidate Profile")
+    new_profile, resume_data = get_candidate_profile()
+    if st.session_state.pop("profile_draft_restored", False):
+        st.info("Restored the changes you applied but did not save last time. Save Profile to keep them.")
+
+    # add link to view the resume file 
+    if st.session_state.profile.s3_link:
+        st.write(f"[View Resume]({st.session_state.profile.s3_link})")
+
+    st.write("Autofill Profile with Resume")
+    uploaded_file = st.file_uploader("Upload your resume (PDF)", type=["pdf"])
+    force_reparse = st.checkbox("Force re-parse", help="Parse the resume again even if this file was parsed before")
+
+    if st.button("Autofill Profile"):
+        if uploaded_file is not None:
+            autofill_profile(uploaded_file, force_reparse=force_reparse)
+        else:
+            st.info("Please upload a resume to autofill your profile.")
+        
+    
+    st.caption("Changes in each section are kept once you apply them. Save Profile sends every applied change.")
+
+    with st.expander("Basic Information", expanded=True):
+        basic_info_section()
+
+    with st.expander("Skills", expanded=True):
+        skills_section()
+
+    with st.expander("Education", expanded=True):
+        education_section()
+
+    with st.expander("Experience", expanded=True):
+        experience_section()
+
+    with st.expander("Projects & Accomplishments", expanded=True):
+        projects_section()
+
+    # Save profile
+    if st.button("Save Profile"):
+        # A fresh serialization, so it can become the snapshot without copying
+        request_data = st.session_state.profile.to_api()
+        
+        if new_profile:
+            # Send update request
+            response = api_request(
+                f"/candidate/save_profile",
+                method="POST",
+                data=request_data,
+                token=st.session_state.user_token
+            )
+            
+            if isinstance(response, dict):
+                return
+            if response.status_code in (200, 201):
+                st.session_state.profile_snapshot = request_data
+                invalidate_profile_cache()
+                get_profile_drafts().invalidate(st.session_state.user_id)
+                st.success("Profile saved successfully!")
+            else:
+                st.error(f"Error: {response.json()["detail"]}")
+        else:
+            response, synced = update_profile(request_data)
+            
+            if response is None:
+                st.info("No changes to save.")
+            elif isinstance(response, dict):
+                return
+            elif response.status_code in (200, 201):
+                st.session_state.profile_snapshot = synced
+                invalidate_profile_cache()
+                get_profile_drafts().invalidate(st.session_state.user_id)
+                st.success("Profile updated successfully!")
+            else:
+                st.error(f"Error: {response.json()["detail"]}")
+
+
+candidate_profile()
@@ -0,0 +1,86 @@
+"""Login and sign-up page"""
+import streamlit as st
+
+from shared import WARMUP_NOTICE_AFTER, api_request, get_backend_warmup, start_session
+
+
+def open_first_page():
+    """Rerun into the logged-in user's pages, candidates starting on their profile"""
+    if st.session_state.role == "candidate":
+        st.session_state.current_page = "candidate_profile"
+    else:
+        st.session_state.current_page = "recruiter_find_matches"
+    st.rerun()
+
+
+def login_page():
+    """Login page for users"""
+    st.title("AI-Driven Recruitment Platform")
+    
+    # Start a sleeping backend while the user types
+    warmup = get_backend_warmup()
+    warmup.trigger()
+    if warmup.elapsed > WARMUP_NOTICE_AFTER:
+        st.info("The service is waking up, so the first login after a quiet spell can take up to a minute.")
+    
+    tab1, tab2 = st.tabs(["Login", "Sign Up"])
+    
+    with tab1:
+        st.subheader("Login")
+        username = st.text_input("Username", key="login_username")
+        password = st.text_input("Password", type="password", key="login_password")
+        
+        if st.button("Login"):
+            if not username or not password:
+                st.error("Please fill in all fields")
+            else:
+                data = {
+                    "username": username,
+                    "password": password
+                }
+                
+                # Exchanging credentials changes nothing, so it is retried like a GET
+                response = api_request(f"/token", "POST", data, form_data=True, idempotent=True)
+                
+                if isinstance(response, dict):
+                    # Connection error, already reported by api_request
+                    pass
+                elif response.status_code in (200, 201):
+                    if start_session(response.json()):
+                        open_first_page()
+                else:
+                    # st.error(f"Error: {response.status_code} - {response.text["detail"]}")
+                    st.error(f"Error: {response.json()["detail"]}")
+    
+    with tab2:
+        st.subheader("Sign Up")
+        name = st.text_input("Username", key="signup_username")
+        email = st.text_input("Email", key="signup_email")
+        password = st.text_input("Password", type="password", key="signup_password")
+        role = st.selectbox("User Role", ["candidate", "recruiter"], key="signup_role")
+        
+        if st.button("Sign Up"):
+            if not name or not email or not password:
+                st.error("Please fill in all fields")
+            else:
+                data = {
+                    "username": name,
+                    "email": email,
+                    "password": password,
+                    "role": role
+                }
+                
+                response = api_request(f"/signup", "POST", data)
+                
+                if isinstance(response, dict):
+                    # Connection error, already reported by api_request
+                    pass
+                elif response.status_code in (200, 201):
+                    st.success(f"Account created successfully!")
+                    if start_session(response.json()):
+                        open_first_page()
+                else:
+                    st.error(f"Error: {response.json()["detail"]}")
+
+
+login_page()
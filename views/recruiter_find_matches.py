@@ -0,0 +1,602 @@
+"""Recruiter search: score uploaded and stored resumes against a job posting"""
+import streamlit as st
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Any, Union
+
+from admission import Overloaded
+from caching import TTLCache, content_digest
+from job_links import canonical_job_link
+from json_codec import response_json
+from multipart_stream import MultipartStream, UploadTooLarge, chunk_uploads, upload_size
+from resume_batch import screen_resumes
+from shared import (
+    JOB_POLL_INITIAL_INTERVAL, MAX_UPLOAD_BYTES_PER_REQUEST, coalesce_key, ensure_fresh_token, find_matches_error,
+    get_admission, get_backend_features, get_job_registry, get_match_cache, poll_match_job, queue_notice,
+    send_coalesced, send_request, shared_cache, show_navigation, split_list, wait_for_prefetch
+)
+from state_store import StoreCache
+
+# Batched resume matching: resumes per request and concurrent requests per search
+FIND_MATCHES_CHUNK_SIZE = 10
+FIND_MATCHES_MAX_WORKERS = 4
+# Seconds between refreshes of a search's progress and partial results
+FIND_MATCHES_PROGRESS_TICK = 0.5
+
+# Seconds between ticks of the background match job's status fragment
+JOB_POLL_TICK = 1
+
+# Match results view: page size choices and rows shown while a batched search is still running
+MATCH_PAGE_SIZES = (10, 25, 50, 100)
+MATCH_PREVIEW_ROWS = 10
+# Orderings offered for match results, label -> match table column
+MATCH_SORT_COLUMNS = {
+    "Re-ranked score": "rank_score",
+    "Match score": "match_score",
+    "Years of experience": "years_of_experience",
+    "Skill overlap": "skill_overlap",
+}
+
+# How long the list of resume hashes already stored by the backend is reused
+RESUME_HASHES_TTL = 600  # seconds
+
+
+def resumes_digest(digests: List[str]) -> str:
+    """Order-independent digest of a set of resume content digests"""
+    return content_digest("\n".join(sorted(digests)).encode())
+
+
+@st.cache_resource
+def get_resume_hashes_cache() -> Union[TTLCache, StoreCache]:
+    """Cache of the resume hashes stored by the backend, shared by every session"""
+    return shared_cache("resume_hashes", 1, RESUME_HASHES_TTL)
+
+
+def get_existing_resume_digests() -> set:
+    """SHA-256 digests of the resumes already stored in the database.
+
+    Returns an empty set if the backend cannot list them.
+    """
+    cache = get_resume_hashes_cache()
+    digests = cache.get("digests")
+    if digests is None:
+        try:
+            response = send_request(f"/recruiter/resume_hashes", "GET", token=st.session_state.user_token)
+        except Exception:
+            return set()
+        digests = response.json() if response.status_code == 200 else []
+        cache.set("digests", digests)
+    return set(digests)
+
+
+def view_candidate_profile(resume_data):
+    """View candidate profile"""
+    st.subheader("Candidate Profile")
+    
+    # Display basic information
+    st.write(f"**Name:** {resume_data.get('name', '')}")
+    st.write(f"**LinkedIn:** {resume_data.get('linkedin', '')}")
+    st.write(f"**GitHub:** {resume_data.get('github', '')}")
+    
+    # Display skills
+    st.write("**Skills:**")
+    skills = resume_data.get("skills", [])
+    if skills:
+        st.write(", ".join(skills))
+    
+    # Display education
+    st.write("**Education:**")
+    education = resume_data.get("education", [])
+    for edu in education:
+        st.write(f"- {edu.get('degree', '')} from {edu.get('institution', '')} (GPA: {edu.get('GPA', '')})")
+    
+    # Display experience
+    st.write("**Experience:**")
+    experience = resume_data.get("experience", [])
+    for exp in experience:
+        st.write(f"- {exp.get('role', '')} at {exp.get('organization', '')} ({exp.get('timeline', {}).get('start', '')} to {exp.get('timeline', {}).get('end', '')}): { ' '.join(exp.get('details', []))} ")
+    
+    # Display projects and accomplishments
+    st.write("**Projects & Accomplishments:**")
+    projects = resume_data.get("accomplishments_and_projects", [])
+    for proj in projects:
+        st.write(f"- {proj.get('name', '')}: {' '.join(proj.get('details', []))}")
+
+
+
+def merge_matches(matches: List[Dict], new_matches: List[Dict]) -> List[Dict]:
+    """Merge a batch of matches into a ranked list, keeping the best score per resume"""
+    merged = {match["resume_link"]: match for match in matches}
+    for match in new_matches:
+        existing = merged.get(match["resume_link"])
+        if existing is None or int(match["match_score"]) > int(existing["match_score"]):
+            merged[match["resume_link"]] = match
+    return sorted(merged.values(), key=lambda match: int(match["match_score"]), reverse=True)
+
+
+def get_match_table(matches: List[Dict]):
+    """Flattened table of the matches being shown, built once per result set"""
+    # pandas is only loaded once a recruiter has results to show
+    from match_table import flatten_matches
+    
+    source, table = st.session_state.match_table or (None, None)
+    if source is not matches:
+        table = flatten_matches(matches)
+        st.session_state.match_table = (matches, table)
+    return table
+
+
+def match_table_controls(key: str) -> tuple:
+    """Filter, sort and re-rank settings for the results view"""
+    with st.expander("Filter and re-rank"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            min_score = st.slider("Minimum match score", 0, 100, 0, key=f"{key}_min_score")
+        with col2:
+            min_years = st.number_input("Minimum years of experience", min_value=0.0, step=1.0, key=f"{key}_min_years")
+        with col3:
+            sort_label = st.selectbox("Sort by", list(MATCH_SORT_COLUMNS), key=f"{key}_sort_by")
+        
+        query_skills = split_list(st.text_input(
+            "Skills to look for (comma separated)", key=f"{key}_query_skills",
+            help="Counted as each candidate's skill overlap"
+        ), ",")
+        required_skills = split_list(st.text_input(
+            "Required skills (comma separated)", key=f"{key}_required_skills",
+            help="Only show candidates listing all of these"
+        ), ",")
+        
+        st.caption("Re-ranked score weights")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            score_weight = st.slider("Match score", 0.0, 1.0, 1.0, 0.1, key=f"{key}_weight_score")
+        with col2:
+            years_weight = st.slider("Experience", 0.0, 1.0, 0.0, 0.1, key=f"{key}_weight_years")
+        with col3:
+            skills_weight = st.slider("Skill overlap", 0.0, 1.0, 0.0, 0.1, key=f"{key}_weight_skills")
+    
+    weights = {"match_score": score_weight, "years_of_experience": years_weight, "skill_overlap": skills_weight}
+    return min_score, min_years, required_skills, query_skills, weights, MATCH_SORT_COLUMNS[sort_label]
+
+
+@st.fragment
+def render_matches(matches: List[Dict], key: str = "matches"):
+    """Display ranked matches a page at a time.
+
+    Filtering, sorting and re-ranking work on the flattened match table, with
+    no backend call. A candidate's profile is only drawn once its row is
+    opened, and every change reruns just this view.
+    """
+    from match_table import filter_matches, rank_matches
+    
+    min_score, min_years, required_skills, query_skills, weights, sort_by = match_table_controls(key)
+    table = filter_matches(get_match_table(matches), min_score, min_years, required_skills)
+    table = rank_matches(table, query_skills, weights, sort_by)
+    
+    st.caption(f"Showing {len(table)} of {len(matches)} matches")
+    if table.empty:
+        return
+    st.dataframe(
+        table[["rank_score", "match_score", "skill_overlap", "years_of_experience", "name", "latest_role", "institution", "resume_link"]],
+        column_config={"resume_link": st.column_config.LinkColumn("resume")},
+        hide_index=True
+    )
+    
+    col1, col2 = st.columns(2)
+    with col2:
+        page_size = st.selectbox("Matches per page", MATCH_PAGE_SIZES, key=f"{key}_page_size")
+    page_count = -(-len(table) // page_size)
+    # A smaller result set or bigger pages can leave the remembered page out of range
+    if st.session_state.get(f"{key}_page", 1) > page_count:
+        st.session_state[f"{key}_page"] = page_count
+    with col1:
+        page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, key=f"{key}_page")
+    
+    start = (page - 1) * page_size
+    for position, index in enumerate(table.index[start:start + page_size], start=start + 1):
+        match = matches[index]
+        with st.container(border=True):
+            st.markdown(f"**#{position} · Match Score: {int(match['match_score'])}%** · [resume]({match['resume_link']})")
+            # Keyed by the match's position in the backend's list, which re-ranking does not change
+            if st.toggle("Show profile", key=f"{key}_profile_{index}"):
+                view_candidate_profile(matches[index]["user_profile"])
+
+
+def render_match_preview(matches: List[Dict]):
+    """Compact table of the top matches, for partial results"""
+    st.dataframe(
+        [
+            {"rank": rank, "match_score": int(match["match_score"]), "resume": match["resume_link"]}
+            for rank, match in enumerate(matches[:MATCH_PREVIEW_ROWS], start=1)
+        ],
+        column_config={"resume": st.column_config.LinkColumn("resume")},
+        hide_index=True
+    )
+
+
+def show_match_results():
+    """Show the latest search's results, kept in session state so paging needs no backend call"""
+    matches = st.session_state.match_results
+    if matches is None:
+        return
+    if len(matches) > 0:
+        st.success(f"Found {len(matches)} matches!")
+        render_matches(matches)
+    else:
+        st.info("No matches found for this job posting")
+
+
+def clear_match_results():
+    """Forget the previous search's results along with its paging and opened rows"""
+    st.session_state.match_results = None
+    st.session_state.match_table = None
+    st.session_state.match_job = None
+    get_job_registry().invalidate(st.session_state.user_id)
+    for key in [key for key in st.session_state if key == "matches_page" or key.startswith("matches_profile_")]:
+        del st.session_state[key]
+
+
+def resume_upload(uploaded_files: List) -> MultipartStream:
+    """Streamed multipart body with each resume under the 'resume_files' field"""
+    return MultipartStream(
+        [('resume_files', file.name, file, 'application/pdf') for file in uploaded_files],
+        max_bytes=MAX_UPLOAD_BYTES_PER_REQUEST
+    )
+
+
+def find_matches_in_batches(params: Dict, uploaded_files: List, digests: List[str], chunk_size: int) -> tuple:
+    """Score resumes in concurrent chunks, rendering partial results as each chunk finishes.
+
+    digests are the uploads' content digests, in the same order. Returns the
+    merged, ranked matches and a list of error messages for failed chunks.
+    While batches wait for an admission slot, the progress bar shows the
+    best place one of them holds in the queue.
+    """
+    chunks = chunk_uploads(uploaded_files, chunk_size, MAX_UPLOAD_BYTES_PER_REQUEST)
+    token = st.session_state.user_token
+    digest_of = {id(file): digest for file, digest in zip(uploaded_files, digests)}
+    
+    progress = st.progress(0.0, text=f"Scoring {len(uploaded_files)} resumes in {len(chunks)} batches...")
+    results = st.empty()
+    matches = []
+    errors = []
+    
+    with ThreadPoolExecutor(max_workers=min(FIND_MATCHES_MAX_WORKERS, len(chunks))) as executor:
+        futures = []
+        for chunk_idx, chunk in enumerate(chunks):
+            # Existing resumes only need scoring once, so only the first chunk asks for them
+            chunk_params = dict(params, include_existing_resumes=params["include_existing_resumes"] and chunk_idx == 0)
+            files = resume_upload(chunk)
+            key = coalesce_key(
+                f"/recruiter/find_matches", "POST", canonical_params(chunk_params),
+                resumes_digest([digest_of[id(file)] for file in chunk])
+            )
+            futures.append(executor.submit(
+                send_coalesced, key, f"/recruiter/find_matches", "POST",
+                token=token, params=chunk_params, files=files
+            ))
+        
+        pending = set(futures)
+        done = 0
+        while pending:
+            finished, pending = wait(pending, timeout=FIND_MATCHES_PROGRESS_TICK, return_when=FIRST_COMPLETED)
+            for future in finished:
+                done += 1
+                try:
+                    response = future.result()
+                    if response.status_code == 200:
+                        matches = merge_matches(matches, response_json(response))
+                    else:
+                        errors.append(find_matches_error(response))
+                except Overloaded as e:
+                    errors.append(str(e))
+                except Exception as e:
+                    errors.append(f"Connection error: {str(e)}")
+            
+            text = f"Scored {done} of {len(chunks)} batches"
+            position = get_admission().queue_position(token)
+            if position is not None:
+                text += f", the service is busy: next batch is number {position} in the queue"
+            progress.progress(done / len(chunks), text=text)
+            if finished and matches:
+                with results.container():
+                    st.caption(f"{len(matches)} matches so far, top {min(len(matches), MATCH_PREVIEW_ROWS)} shown")
+                    render_match_preview(matches)
+    
+    progress.empty()
+    results.empty()
+    return matches, errors
+
+
+def match_stream_preview() -> tuple:
+    """A list of matches filled as a search's response is decoded, the on_items callback that fills
+    it, and the placeholder previewing the top matches meanwhile.
+
+    The backend sends matches best first, so the preview is final as soon as
+    it fills; only the count is redrawn, at most every FIND_MATCHES_PROGRESS_TICK.
+    """
+    matches = []
+    placeholder = st.empty()
+    drawn_at = 0.0
+    
+    def add(items: List[Dict]):
+        nonlocal drawn_at
+        matches.extend(items)
+        if time.monotonic() - drawn_at >= FIND_MATCHES_PROGRESS_TICK:
+            drawn_at = time.monotonic()
+            with placeholder.container():
+                st.caption(f"{len(matches)} matches so far, top {min(len(matches), MATCH_PREVIEW_ROWS)} shown")
+                render_match_preview(matches)
+    
+    return matches, add, placeholder
+
+
+def submit_match_job(params: Dict, files: Any, cache_key: tuple) -> bool:
+    """Submit a search as a background job.
+
+    Returns False if the backend does not support jobs.
+    """
+    try:
+        response = send_request(
+            f"/recruiter/find_matches/jobs",
+            method="POST",
+            token=st.session_state.user_token,
+            params=params,
+            files=files,
+            on_queued=queue_notice()
+        )
+    except Overloaded as e:
+        st.warning(str(e))
+        return True
+    except Exception as e:
+        st.error(f"Connection error: {str(e)}")
+        return True
+    
+    if response.status_code in (404, 405, 501):
+        get_backend_features()["find_matches_jobs"] = False
+        return False
+    if response.status_code not in (200, 201, 202):
+        st.error(find_matches_error(response))
+        return True
+    
+    job = {
+        "job_id": response.json()["job_id"],
+        "cache_key": cache_key,
+        "status": "queued",
+        "poll_interval": JOB_POLL_INITIAL_INTERVAL,
+        "next_poll_at": time.time() + JOB_POLL_INITIAL_INTERVAL,
+        "matches": None,
+        "error": None
+    }
+    st.session_state.match_job = job
+    get_job_registry().set(st.session_state.user_id, job)
+    return True
+
+
+@st.fragment(run_every=JOB_POLL_TICK)
+def match_job_progress():
+    """Poll the running job without rerunning the rest of the page"""
+    ensure_fresh_token()
+    if not st.session_state.user_token:
+        st.rerun()
+    job = st.session_state.match_job
+    if job["status"] in ("done", "failed"):
+        # Finished since the last full run, redraw the page with the results
+        st.rerun()
+    if time.time() >= job["next_poll_at"]:
+        poll_match_job(job, st.session_state.user_token)
+        get_job_registry().set(st.session_state.user_id, job)
+        if job["status"] in ("done", "failed"):
+            st.rerun()
+    st.info(f"Finding matches in the background ({job['status']})... you can keep working or refresh the page.")
+
+
+def show_match_job():
+    """Show the progress or results of the user's latest background search"""
+    if st.session_state.match_job is None:
+        # A reconnecting session picks up the job the user started earlier,
+        # once the status check started at login is back
+        wait_for_prefetch("last_search")
+        st.session_state.match_job = get_job_registry().get(st.session_state.user_id)
+    job = st.session_state.match_job
+    if job is None:
+        return
+    
+    if job["status"] not in ("done", "failed"):
+        match_job_progress()
+        return
+    
+    if job["status"] == "failed":
+        st.error(job["error"])
+    elif len(job["matches"]) > 0:
+        st.success(f"Found {len(job['matches'])} matches!")
+        render_matches(job["matches"])
+    else:
+        st.info("No matches found for this job posting")
+    
+    if st.button("Clear results"):
+        clear_match_results()
+        st.rerun()
+
+
+def canonical_params(params: Dict) -> Dict:
+    """Search params with the canonical job link, for keys shared by equivalent searches"""
+    return dict(params, job_link=canonical_job_link(params["job_link"]))
+
+
+def run_match_search(job_link: str, match_criteria: str, include_existing_resumes: bool,
+                     uploaded_files: Optional[List], batch_mode: bool, chunk_size: int,
+                     background_mode: bool):
+    """Run a recruiter search and display the ranked matches"""
+    if not job_link:
+        st.error("Please enter a job link to continue. This is a required field.")
+        return
+    job_link = job_link.strip()
+
+    # A new search replaces the previous results, background or not
+    clear_match_results()
+
+    # Map UI selection to API expected values
+    match_criteria_map = {
+        "Strict": 3,
+        "Moderate": 2,
+        "Flexible": 1
+    }
+
+    # Set up query parameters
+    params = {
+        "job_link": job_link,
+        "match_criteria": match_criteria_map[match_criteria],
+        "include_existing_resumes": include_existing_resumes
+    }
+
+    uploaded_files = uploaded_files or []
+    oversized = [file for file in uploaded_files if upload_size(file) > MAX_UPLOAD_BYTES_PER_REQUEST]
+    for file in oversized:
+        st.error(f"{file.name} is larger than the {MAX_UPLOAD_BYTES_PER_REQUEST // 2**20} MB upload limit and was skipped")
+    uploaded_files = [file for file in uploaded_files if upload_size(file) <= MAX_UPLOAD_BYTES_PER_REQUEST]
+
+    # Drop corrupt files, in-batch duplicates and resumes the database already holds
+    existing_digests = get_existing_resume_digests() if include_existing_resumes and uploaded_files else None
+    batch = screen_resumes(uploaded_files, existing_digests)
+    for file, reason in batch.rejected:
+        st.error(f"{file.name} was skipped: {reason}")
+    if batch.duplicates:
+        st.warning("Skipped duplicate uploads: " + ", ".join(
+            f"{file.name} (same as {original.name})" for file, original in batch.duplicates
+        ))
+    if batch.existing:
+        st.info("Already in the database, matched from the stored copy: " + ", ".join(
+            file.name for file in batch.existing
+        ))
+    uploaded_files = batch.files
+
+    match_cache = get_match_cache()
+    uploads_digest = resumes_digest(batch.digests)
+    # Equivalent spellings of a posting share cache entries and backend work
+    cache_key = (
+        "find_matches",
+        canonical_job_link(job_link),
+        params["match_criteria"],
+        include_existing_resumes,
+        uploads_digest
+    )
+    matches = match_cache.get(cache_key)
+    total_bytes = sum(upload_size(file) for file in uploaded_files)
+
+    if matches is None and background_mode and get_backend_features()["find_matches_jobs"]:
+        try:
+            files = resume_upload(uploaded_files) if uploaded_files else []
+        except UploadTooLarge as e:
+            st.error(f"{e}. Turn off background mode to upload in batches.")
+            return
+        if submit_match_job(params, files, cache_key):
+            return
+        # The backend has no job API, run the search synchronously instead
+
+    if matches is not None:
+        st.caption("Showing cached results for this search")
+    elif batch_mode and (len(uploaded_files) > chunk_size or total_bytes > MAX_UPLOAD_BYTES_PER_REQUEST):
+        matches, errors = find_matches_in_batches(params, uploaded_files, batch.digests, int(chunk_size))
+        for error in errors:
+            st.error(error)
+        if errors and not matches:
+            return
+        if not errors:
+            match_cache.set(cache_key, matches)
+    else:
+        try:
+            # Each file goes under the same field name 'resume_files'; no files sends no body
+            files = resume_upload(uploaded_files) if uploaded_files else []
+        except UploadTooLarge as e:
+            st.error(f"{e}. Turn on batch mode to split the upload.")
+            return
+
+        streamed, show_streamed, preview = match_stream_preview()
+        try:
+            with st.spinner("Finding matches..."):
+                # Make the API request, or share an identical one another session is making.
+                # Matches are shown as they arrive if this session makes it.
+                response = send_coalesced(
+                    coalesce_key(f"/recruiter/find_matches", "POST", canonical_params(params), uploads_digest),
+                    f"/recruiter/find_matches",
+                    method="POST",
+                    token=st.session_state.user_token,
+                    params=params,
+                    files=files,
+                    on_queued=queue_notice(),
+                    on_items=show_streamed,
+                )
+        except Overloaded as e:
+            st.warning(str(e))
+            return
+        except Exception as e:
+            st.error(f"Connection error: {str(e)}")
+            return
+        finally:
+            preview.empty()
+
+        if response.status_code != 200:
+            st.error(find_matches_error(response))
+            return
+        # A response shared from another session's call was not streamed here
+        matches = streamed or response_json(response)
+        match_cache.set(cache_key, matches)
+
+    st.session_state.match_results = matches
+
+
+def recruiter_find_matches():
+    """Page for finding candidates based on job link and resumes"""
+    show_navigation()
+    st.title("Find Matches")
+    
+    # Add required field indicator at the top of the form
+    st.markdown("<small style='color: red;'>* Required field</small>", unsafe_allow_html=True)
+
+    # Input fields with required indicator
+    job_link = st.text_input(
+        "Enter Job Link *", 
+        placeholder="https://www.example.com/job-posting",
+        help="Required field - paste the URL of the job posting"
+    )
+    
+    match_criteria = st.selectbox(
+        "Select Match Criteria", 
+        options=["Flexible", "Moderate", "Strict"],
+        index=1,  # Default to Moderate
+        help="Strict (3) requires exact matches, Moderate (2) is balanced, Flexible (1) allows more variation"
+    )
+    
+    include_existing_resumes = st.checkbox("Include existing resumes stored in database", value=True)
+    
+    uploaded_files = st.file_uploader(
+        "Upload new resumes for matching (PDF)", 
+        type="pdf", 
+        accept_multiple_files=True
+    )
+    
+    batch_mode = st.checkbox(
+        "Upload resumes in parallel batches",
+        value=True,
+        help="Split large uploads into smaller requests that are scored concurrently"
+    )
+    chunk_size = FIND_MATCHES_CHUNK_SIZE
+    if batch_mode:
+        chunk_size = st.number_input("Resumes per batch", min_value=1, max_value=100, value=FIND_MATCHES_CHUNK_SIZE)
+    
+    background_mode = st.checkbox(
+        "Run search in the background",
+        value=False,
+        help="Keep the page responsive while matching, and pick the results up again after a refresh"
+    )
+    
+    if st.button("Find Matches", type="primary"):
+        run_match_search(job_link, match_criteria, include_existing_resumes, uploaded_files,
+                         batch_mode, int(chunk_size), background_mode)
+    
+    show_match_job()
+    show_match_results()
+
+
+recruiter_find_matches()